@@ -1,2 +1,3 @@
 from . import patches
 from . import functions
+from . import search
@@ -0,0 +1,47 @@
+from django.db import NotSupportedError
+from django.db.models import Aggregate, BigIntegerField, FloatField
+
+from .functions import as_sqlserver
+
+
+class ApproxCountDistinct(Aggregate):
+    function = 'APPROX_COUNT_DISTINCT'
+    name = 'ApproxCountDistinct'
+    output_field = BigIntegerField()
+    empty_result_set_value = 0
+
+
+class _ApproxPercentile(Aggregate):
+    template = '%(function)s(%(percentile)s) WITHIN GROUP (ORDER BY %(expressions)s)'
+
+    def __init__(self, expression, percentile, **extra):
+        if not 0 <= percentile <= 1:
+            raise ValueError('percentile must be between 0 and 1.')
+        # sql server only accepts a literal
+        super().__init__(expression, percentile=repr(float(percentile)), **extra)
+
+
+class ApproxPercentileCont(_ApproxPercentile):
+    function = 'APPROX_PERCENTILE_CONT'
+    name = 'ApproxPercentileCont'
+    output_field = FloatField()
+
+
+class ApproxPercentileDisc(_ApproxPercentile):
+    function = 'APPROX_PERCENTILE_DISC'
+    name = 'ApproxPercentileDisc'
+
+
+@as_sqlserver(ApproxCountDistinct)
+def approx_count_distinct(self, compiler, connection, **extra_context):
+    if connection.features.supports_approx_count_distinct:
+        return self.as_sql(compiler, connection, **extra_context)
+    return self.as_sql(compiler, connection, template='COUNT_BIG(DISTINCT %(expressions)s)', **extra_context)
+
+
+@as_sqlserver(ApproxPercentileCont)
+@as_sqlserver(ApproxPercentileDisc)
+def approx_percentile(self, compiler, connection, **extra_context):
+    if not connection.features.supports_approx_percentile:
+        raise NotSupportedError('%s requires SQL Server 2022.' % self.function)
+    return self.as_sql(compiler, connection, **extra_context)
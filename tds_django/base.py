@@ -1,9 +1,15 @@
+from collections import Counter
+from decimal import Decimal
+
 import pytds
+from pytds.tds_base import Param
+from pytds.tds_types import sql_type_by_declaration
 from django.core.exceptions import ImproperlyConfigured
 from django.conf import settings
 from django.db import IntegrityError
 from django.db.backends.base.base import BaseDatabaseWrapper
 from django.utils.asyncio import async_unsafe
+from django.utils.functional import cached_property
 from .client import DatabaseClient
 from .creation import DatabaseCreation
 from .features import DatabaseFeatures
@@ -11,6 +17,82 @@ from .introspection import DatabaseIntrospection
 from .operations import DatabaseOperations
 from .schema import DatabaseSchemaEditor
 from .validation import DatabaseValidation
+from .sql.queries import Misc
+
+
+class CursorWrapper:
+    """
+    Declare string, binary and decimal parameters with fixed types instead of the type pytds infers from each
+    value (NVARCHAR(5) vs NVARCHAR(17)...) so that a query shape always maps to the same sp_executesql signature,
+    hence to one cached plan.
+    """
+    _types = {}
+    # decimals fitting DECIMAL(38, 10) share its declaration, others are declared at their own scale
+    decimal_scale = 10
+
+    def __init__(self, cursor, signatures, max_signatures):
+        self.cursor = cursor
+        self.signatures = signatures
+        self.max_signatures = max_signatures
+
+    @classmethod
+    def _type(cls, declaration):
+        if declaration not in cls._types:
+            cls._types[declaration] = sql_type_by_declaration(declaration)
+        return cls._types[declaration]
+
+    @classmethod
+    def _declaration(cls, value):
+        if isinstance(value, str):
+            return 'NVARCHAR(4000)' if len(value) <= 4000 else 'NVARCHAR(MAX)'
+        if isinstance(value, (bytes, bytearray)):
+            return 'VARBINARY(8000)' if len(value) <= 8000 else 'VARBINARY(MAX)'
+        if isinstance(value, Decimal) and value.is_finite():
+            value = value.as_tuple()
+            scale = min(max(-value.exponent, 0), 38)
+            if scale <= cls.decimal_scale and len(value.digits) - scale <= 38 - cls.decimal_scale:
+                scale = cls.decimal_scale
+            return 'DECIMAL(38, %d)' % scale
+        return None
+
+    def _normalize(self, value):
+        declaration = self._declaration(value)
+        if declaration is None:
+            return value
+        return Param(type=self._type(declaration), value=value)
+
+    def _signature(self, value):
+        if isinstance(value, Param):
+            return value.type.get_declaration()
+        return type(value).__name__
+
+    def normalize_params(self, sql, params):
+        if not params:
+            return params
+        if isinstance(params, dict):
+            params = {k: self._normalize(v) for k, v in params.items()}
+            values = params.values()
+        else:
+            params = tuple(self._normalize(v) for v in params)
+            values = params
+        if self.max_signatures:
+            key = (hash(sql), tuple(self._signature(v) for v in values))
+            if key in self.signatures or len(self.signatures) < self.max_signatures:
+                self.signatures[key] += 1
+        return params
+
+    def execute(self, sql, params=None):
+        # without params pytds does not %-format the sql
+        return self.cursor.execute(sql, self.normalize_params(sql, params))
+
+    def executemany(self, sql, param_list):
+        return self.cursor.executemany(sql, [self.normalize_params(sql, params) for params in param_list])
+
+    def __getattr__(self, attr):
+        return getattr(self.cursor, attr)
+
+    def __iter__(self):
+        return iter(self.cursor)
 
 
 class DatabaseWrapper(BaseDatabaseWrapper):
@@ -99,6 +181,15 @@ class DatabaseWrapper(BaseDatabaseWrapper):
     ops_class = DatabaseOperations
     validation_class = DatabaseValidation
 
+    # (host, port, database) -> (major version, compatibility level), shared by all connections
+    _server_info = {}
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # (hash of the sql, parameter declarations) -> number of executions, len() is the number of distinct
+        # signatures. Only collected up to settings.TDS_PARAM_SIGNATURES signatures
+        self.param_signatures = Counter()
+
     def get_connection_params(self):
         settings_dict = self.settings_dict
         # TODO warnings for user
@@ -124,13 +215,31 @@ class DatabaseWrapper(BaseDatabaseWrapper):
     def init_connection_state(self):
         pass
 
+    @cached_property
+    def sql_server_info(self):
+        """ (major version, compatibility level) of the server and database, queried once per database """
+        key = (self.settings_dict['HOST'], self.settings_dict['PORT'], self.settings_dict['NAME'])
+        if key not in self._server_info:
+            with self.temporary_connection() as cursor:
+                cursor.execute(Misc.server_info)
+                self._server_info[key] = tuple(cursor.fetchone())
+        return self._server_info[key]
+
+    @cached_property
+    def sql_server_level(self):
+        """ features available on the connection: the lowest of version (as a compatibility level) and
+        database compatibility level, ie 160 for SQL Server 2022 at compatibility level 160 """
+        version, compatibility_level = self.sql_server_info
+        return min(version * 10, compatibility_level or version * 10)
+
     def _set_autocommit(self, autocommit):
         with self.wrap_database_errors:
             self.connection.autocommit = autocommit
 
     @async_unsafe
     def create_cursor(self, name=None):
-        return self.connection.cursor()
+        return CursorWrapper(self.connection.cursor(), self.param_signatures,
+                             getattr(settings, 'TDS_PARAM_SIGNATURES', 0))
 
     def _savepoint_commit(self, sid):
         pass
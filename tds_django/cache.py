@@ -0,0 +1,112 @@
+import base64
+import json
+import pickle
+from datetime import datetime
+
+from django.conf import settings
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.core.cache.backends.db import DatabaseCache as BaseDatabaseCache
+from django.db import DatabaseError, connections, router
+from django.utils import timezone
+
+from tds_django.sql.queries import Cache
+
+
+class DatabaseCache(BaseDatabaseCache):
+    """
+    Database cache for SQL Server, BACKEND = 'tds_django.cache.DatabaseCache' with a table created by createcachetable
+    - set/add are a single MERGE, set_many one MERGE over OPENJSON
+    - get_many/delete_many send the keys as one OPENJSON parameter, expired rows are ignored instead of deleted
+    - the size comes from the table metadata and culling deletes TOP n rows using the expires index
+    """
+
+    def _db(self, write):
+        db = router.db_for_write(self.cache_model_class) if write else router.db_for_read(self.cache_model_class)
+        return db, connections[db]
+
+    @staticmethod
+    def _now(connection):
+        return connection.ops.adapt_datetimefield_value(timezone.now().replace(microsecond=0))
+
+    def _expires(self, connection, timeout):
+        timeout = self.get_backend_timeout(timeout)
+        if timeout is None:
+            exp = datetime.max
+        else:
+            exp = datetime.fromtimestamp(timeout, tz=timezone.utc if settings.USE_TZ else None)
+        return connection.ops.adapt_datetimefield_value(exp.replace(microsecond=0))
+
+    def _encode(self, value):
+        return base64.b64encode(pickle.dumps(value, self.pickle_protocol)).decode('latin1')
+
+    def get_many(self, keys, version=None):
+        if not keys:
+            return {}
+        key_map = {self.make_and_validate_key(key, version=version): key for key in keys}
+        db, connection = self._db(write=False)
+        with connection.cursor() as cursor:
+            cursor.execute(Cache.get_many % {'table': connection.ops.quote_name(self._table)},
+                           [json.dumps(list(key_map)), self._now(connection)])
+            rows = cursor.fetchall()
+        return {
+            key_map[key]: pickle.loads(base64.b64decode(connection.ops.process_clob(value).encode()))
+            for key, value in rows
+        }
+
+    def _base_set(self, mode, key, value, timeout=DEFAULT_TIMEOUT):
+        db, connection = self._db(write=True)
+        table = connection.ops.quote_name(self._table)
+        exp = self._expires(connection, timeout)
+        now = self._now(connection)
+        with connection.cursor() as cursor:
+            self._cull_if_full(db, cursor, now)
+            try:
+                if mode == 'touch':
+                    cursor.execute(Cache.touch % {'table': table}, [exp, key, now])
+                elif mode == 'add':
+                    cursor.execute(Cache.add % {'table': table}, [key, self._encode(value), exp, now])
+                else:
+                    cursor.execute(Cache.set % {'table': table}, [key, self._encode(value), exp])
+            except DatabaseError:
+                return False
+            return cursor.rowcount > 0
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        if not data:
+            return []
+        db, connection = self._db(write=True)
+        exp = self._expires(connection, timeout)
+        rows = [[self.make_and_validate_key(key, version=version), self._encode(value)] for key, value in data.items()]
+        with connection.cursor() as cursor:
+            self._cull_if_full(db, cursor, self._now(connection))
+            try:
+                cursor.execute(Cache.set_many % {'table': connection.ops.quote_name(self._table)},
+                               [json.dumps(rows), exp, exp])
+            except DatabaseError:
+                return list(data)
+        return []
+
+    def _base_delete_many(self, keys):
+        if not keys:
+            return False
+        db, connection = self._db(write=True)
+        with connection.cursor() as cursor:
+            cursor.execute(Cache.delete_many % {'table': connection.ops.quote_name(self._table)},
+                           [json.dumps(list(keys))])
+            return cursor.rowcount > 0
+
+    def _cull_if_full(self, db, cursor, now):
+        cursor.execute(Cache.count, [self._table])
+        num = cursor.fetchone()[0] or 0
+        if num > self._max_entries:
+            self._cull(db, cursor, now, num)
+
+    def _cull(self, db, cursor, now, num):
+        if self._cull_frequency == 0:
+            self.clear()
+            return
+        table = connections[db].ops.quote_name(self._table)
+        cull_num = num // self._cull_frequency
+        cursor.execute(Cache.cull_expired % {'table': table}, [cull_num, now])
+        if num - cursor.rowcount > self._max_entries:
+            cursor.execute(Cache.cull % {'table': table}, [cull_num])
@@ -1,8 +1,12 @@
 import re
 
 from itertools import chain
+from django.db import NotSupportedError
 from django.db.models.expressions import Subquery, RawSQL
 from django.db.models.sql import compiler
+from django.db.models.sql.datastructures import BaseTable
+from django.db.models.sql.query import Query
+from django.utils.functional import cached_property
 
 
 class SQLCompiler(compiler.SQLCompiler):
@@ -36,6 +40,26 @@ class SQLCompiler(compiler.SQLCompiler):
             order_by = [(None, ('1 ASC', [], None)), ]
         return order_by
 
+    def apply_converters(self, rows, converters):
+        return map(self.connection.ops.get_row_converter(converters), rows)
+
+    def get_from_clause(self):
+        result, params = super().get_from_clause()
+        tablesample = getattr(self.query, 'tablesample', None)
+        if tablesample:
+            # see QuerySet.sample, result has an entry per referenced alias (then the extra tables)
+            tables = [table for alias, table in self.query.alias_map.items() if self.query.alias_refcount[alias]]
+            db_table = self.query.model._meta.db_table
+            index = next((i for i, table in enumerate(tables)
+                          if isinstance(table, BaseTable) and table.table_name == db_table), None)
+            if index is None:
+                raise NotSupportedError('sample() needs the table of the model in the FROM clause.')
+            percent, seed = tablesample
+            result[index] += ' TABLESAMPLE (%s PERCENT)' % float(percent)
+            if seed is not None:
+                result[index] += ' REPEATABLE (%d)' % seed
+        return result, params
+
     def collapse_group_by(self, expressions, having):
         expressions = super().collapse_group_by(expressions, having)
 
@@ -170,6 +194,11 @@ class SQLInsertCompiler(compiler.SQLInsertCompiler, SQLCompiler):
 
 
 class SQLDeleteCompiler(compiler.SQLDeleteCompiler, SQLCompiler):
+    @cached_property
+    def single_alias(self):
+        # DELETE has no FROM clause to sample, a sampled delete goes through the pk__in subquery
+        return super().single_alias and not getattr(self.query, 'tablesample', None)
+
     def as_sql(self):
         sql, params = super().as_sql()
         if sql:
@@ -178,6 +207,24 @@ class SQLDeleteCompiler(compiler.SQLDeleteCompiler, SQLCompiler):
 
 
 class SQLUpdateCompiler(compiler.SQLUpdateCompiler, SQLCompiler):
+    def pre_sql_setup(self):
+        tablesample = getattr(self.query, 'tablesample', None)
+        if tablesample:
+            # UPDATE has no FROM clause to sample, the rows are restricted to pk__in the sample
+            refcounts_before = self.query.alias_refcount.copy()
+            self.query.get_initial_alias()
+            query = self.query.chain(klass=Query)
+            query.select_related = False
+            query.clear_ordering(force=True)
+            query.extra = {}
+            query.select = []
+            query.add_fields([query.get_meta().pk.name])
+            self.query.tablesample = None
+            self.query.clear_where()
+            self.query.add_filter('pk__in', query)
+            self.query.reset_refcounts(refcounts_before)
+        super().pre_sql_setup()
+
     def as_sql(self):
         sql, params = super().as_sql()
         if sql:
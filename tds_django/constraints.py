@@ -0,0 +1,43 @@
+from django.db.models import BaseConstraint
+
+
+class TableOptions(BaseConstraint):
+    """
+    Options of the table, declared in Meta.constraints so that migrations track them: data_compression (see
+    CompressedIndex), partitioning (a tds_django.partitioning.Partitioning) and memory_optimized (True or the
+    durability). The schema editor applies them when the table is created or rebuilt, other backends ignore them.
+    """
+
+    def __init__(self, *, name, data_compression=None, partitioning=None, memory_optimized=None):
+        super().__init__(name=name)
+        self.data_compression = data_compression
+        self.partitioning = partitioning
+        self.memory_optimized = memory_optimized
+
+    def constraint_sql(self, model, schema_editor):
+        return None
+
+    def create_sql(self, model, schema_editor):
+        return None
+
+    def remove_sql(self, model, schema_editor):
+        return None
+
+    def validate(self, model, instance, exclude=None, using=None):
+        pass
+
+    def __eq__(self, other):
+        if isinstance(other, TableOptions):
+            return self.deconstruct() == other.deconstruct()
+        return super().__eq__(other)
+
+    def __repr__(self):
+        return '<%s: name=%r>' % (self.__class__.__qualname__, self.name)
+
+    def deconstruct(self):
+        path, args, kwargs = super().deconstruct()
+        for option in ('data_compression', 'partitioning', 'memory_optimized'):
+            value = getattr(self, option)
+            if value:
+                kwargs[option] = value
+        return path, args, kwargs
@@ -1,7 +1,10 @@
 from django.db.backends.base.creation import BaseDatabaseCreation
 
+from tds_django.sql.queries import Creation
+
 
 class DatabaseCreation(BaseDatabaseCreation):
+    _clone_backup = None
 
     def create_test_db(self, *args, **kwargs):
         import os
@@ -14,8 +17,122 @@ class DatabaseCreation(BaseDatabaseCreation):
                     sql = file.read()
                     for s in sql.split('\nGO\n'):
                         cursor.execute(s)
+        self._create_snapshot(db_name, kwargs.get('verbosity', args[0] if args else 1))
         return db_name
 
     def sql_table_creation_suffix(self):
         """ a lot of tests expect case sensitivity """
         return 'COLLATE Latin1_General_100_CS_AS_SC '
+
+    @staticmethod
+    def _server_path(physical_name, file_name, keep_ext=True):
+        """ path of file_name in the server directory of physical_name """
+        sep = '\\' if '\\' in physical_name else '/'
+        directory, _, name = physical_name.rpartition(sep)
+        ext = name[name.rfind('.'):] if keep_ext and '.' in name else ''
+        return f'{directory}{sep}{file_name}{ext}'
+
+    def _clone_test_db(self, suffix, verbosity, keepdb=False):
+        """
+        Clone the initialized test database (init.sql and clr.sql included) with BACKUP / RESTORE.
+        The backup is done once and restored for every worker.
+        """
+        qn = self.connection.ops.quote_name
+        source_database_name = self.connection.settings_dict['NAME']
+        target_database_name = self.get_test_db_clone_settings(suffix)['NAME']
+        with self._nodb_cursor() as cursor:
+            cursor.execute('SELECT DB_ID(%s)', (target_database_name, ))
+            if cursor.fetchone()[0] is not None:
+                if keepdb:
+                    return
+                if verbosity >= 1:
+                    self.log('Destroying old test database for alias %s...' % (
+                        self._get_database_display_str(verbosity, target_database_name),
+                    ))
+                cursor.execute(Creation.drop_database % {'database': qn(target_database_name)})
+
+            cursor.execute(Creation.database_files, (source_database_name, ))
+            files = cursor.fetchall()
+            if self._clone_backup is None:
+                data_file = next(physical_name for _, physical_name, type_ in files if type_ == 0)
+                backup = self._server_path(data_file, f'{source_database_name}_clone.bak', keep_ext=False)
+                cursor.execute(Creation.backup % {'database': qn(source_database_name)}, (backup, ))
+                self._clone_backup = backup
+
+            moves, params = [], [self._clone_backup]
+            for name, physical_name, type_ in files:
+                moves.append('MOVE %s TO %s')
+                params += [name, self._server_path(physical_name, f'{target_database_name}_{name}')]
+            cursor.execute(Creation.restore % {
+                'database': qn(target_database_name),
+                'moves': ', '.join(moves),
+            }, params)
+        self._create_snapshot(target_database_name, verbosity)
+
+    def destroy_test_db(self, *args, **kwargs):
+        super().destroy_test_db(*args, **kwargs)
+        self._delete_clone_backup()
+
+    def _delete_clone_backup(self):
+        """ the backup restored for each clone is deleted when the test databases are torn down """
+        if self._clone_backup is None:
+            return
+        with self._nodb_cursor() as cursor:
+            cursor.execute(Creation.delete_backup, (self._clone_backup, ))
+        self._clone_backup = None
+
+    def _destroy_test_db(self, test_database_name, verbosity):
+        with self._nodb_cursor() as cursor:
+            cursor.execute('DROP DATABASE IF EXISTS %s' % self.connection.ops.quote_name(
+                self._snapshot_name(test_database_name)))
+        super()._destroy_test_db(test_database_name, verbosity)
+
+    @staticmethod
+    def _snapshot_name(database_name):
+        return f'{database_name}_snapshot'
+
+    def _snapshot_enabled(self):
+        """ opt-in with DATABASES[...]['TEST']['SNAPSHOT_RESET'] = True """
+        return bool(self.connection.settings_dict['TEST'].get('SNAPSHOT_RESET'))
+
+    def _create_snapshot(self, database_name, verbosity=1):
+        """ snapshot of the migrated test database, replaces the flush between TransactionTestCase """
+        if not self._snapshot_enabled():
+            return
+        qn = self.connection.ops.quote_name
+        quote_value = self.connection.SchemaEditorClass.quote_value
+        snapshot = self._snapshot_name(database_name)
+        if verbosity >= 1:
+            self.log('Creating snapshot %s...' % snapshot)
+        with self._nodb_cursor() as cursor:
+            cursor.execute('DROP DATABASE IF EXISTS %s' % qn(snapshot))
+            cursor.execute(Creation.database_files, (database_name, ))
+            files = [
+                '(NAME = %s, FILENAME = %s)' % (
+                    qn(name), quote_value(self._server_path(physical_name, f'{snapshot}_{name}.ss', keep_ext=False))
+                )
+                for name, physical_name, type_ in cursor.fetchall() if type_ == 0
+            ]
+            cursor.execute(Creation.create_snapshot % {
+                'snapshot': qn(snapshot),
+                'files': ', '.join(files),
+                'database': qn(database_name),
+            })
+
+    def restore_snapshot(self):
+        """ reset the test database from its snapshot, returns False if there is no snapshot to restore """
+        if not self._snapshot_enabled():
+            return False
+        database_name = self.connection.settings_dict['NAME']
+        snapshot = self._snapshot_name(database_name)
+        with self._nodb_cursor() as cursor:
+            cursor.execute(Creation.snapshot_exists, (snapshot, database_name))
+            if not cursor.fetchone()[0]:
+                return False
+            # RESTORE needs exclusive access
+            self.connection.close()
+            cursor.execute(Creation.restore_snapshot % {
+                'database': self.connection.ops.quote_name(database_name),
+                'snapshot': self.connection.SchemaEditorClass.quote_value(snapshot),
+            })
+        return True
@@ -0,0 +1,33 @@
+from django.db.migrations.operations.base import Operation
+
+
+class IndexOptions(Operation):
+    """
+    Options of the index creations and column alterations run by the following operations of the migration:
+    online, resumable with max_duration (minutes), maxdop and wait_at_low_priority as (minutes, 'NONE' | 'SELF' |
+    'BLOCKERS'). Column alterations only use online. IndexOptions() resets them.
+    """
+    reversible = True
+    option_names = {'online', 'resumable', 'max_duration', 'maxdop', 'wait_at_low_priority'}
+
+    def __init__(self, **options):
+        unknown = set(options) - self.option_names
+        if unknown:
+            raise ValueError('Unknown index options: %s.' % ', '.join(sorted(unknown)))
+        if options.get('resumable') and not options.get('online'):
+            raise ValueError('A resumable index operation has to be online.')
+        self.options = options
+
+    def state_forwards(self, app_label, state):
+        pass
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'sqlserver':
+            schema_editor.index_options = self.options
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        # operations are unapplied in reverse order, the options set here would apply to the previous ones
+        pass
+
+    def describe(self):
+        return 'Set index options %s' % ', '.join('%s=%r' % item for item in sorted(self.options.items()))
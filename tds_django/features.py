@@ -15,6 +15,7 @@ class DatabaseFeatures(BaseDatabaseFeatures):
     allow_sliced_subqueries_with_in = False  # TODO CHECK
     allows_group_by_select_index = False
 
+    can_clone_databases = True
     can_create_inline_fk = False
 
     can_return_columns_from_insert = True
@@ -36,7 +37,7 @@ class DatabaseFeatures(BaseDatabaseFeatures):
     supports_boolean_expr_in_select_clause = False
     supports_covering_indexes = True
     supports_comparing_boolean_expr = False
-    supports_expression_indexes = False  # would need to manage computed column
+    supports_expression_indexes = True  # through persisted computed columns
     supports_ignore_conflicts = False
     supports_index_on_text_field = False
     supports_order_by_nulls_modifier = False
@@ -239,6 +240,26 @@ class DatabaseFeatures(BaseDatabaseFeatures):
         'swedish_ci': 'Finnish_Swedish_CI_AI'  # Swedish case-insensitive.
     }
 
+    @cached_property
+    def supports_approx_count_distinct(self):
+        return self.connection.sql_server_level >= 150
+
+    @cached_property
+    def supports_approx_percentile(self):
+        return self.connection.sql_server_level >= 160
+
+    @cached_property
+    def supports_datetrunc(self):
+        return self.connection.sql_server_level >= 160
+
+    @cached_property
+    def supports_greatest_least(self):
+        return self.connection.sql_server_level >= 160
+
+    @cached_property
+    def supports_json_path_exists(self):
+        return self.connection.sql_server_level >= 160
+
     @cached_property
     def introspected_field_types(self):
         return {
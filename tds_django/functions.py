@@ -1,12 +1,17 @@
+import json
+
+from django.db import DatabaseError
 from django.db.models import BooleanField, IntegerField, Lookup
 from django.db.models.aggregates import Avg, Count, StdDev, Variance
 from django.db.models.expressions import Value, OrderBy, OrderByList, Exists, RawSQL, Window, ExpressionList, Case, When, \
-    DurationExpression, CombinedExpression
+    DurationExpression, CombinedExpression, Col, ExpressionWrapper
 from django.db.models.fields import DecimalField, FloatField
-from django.db.models.fields.json import HasKeyLookup
+from django.db.models.fields.json import HasKeyLookup, KeyTransform, KeyTransformExact
 from django.db.models.functions import Now, ATan2, Cast, Chr, Collate, Greatest, Least, Length, LPad, Random, \
     Repeat, RPad, StrIndex, Substr, Log, Ln, Mod, Round, Degrees, Power, Radians, RowNumber
-from django.db.models.lookups import BuiltinLookup
+from django.db.models.lookups import BuiltinLookup, Exact, IsNull
+from django.db.models.sql.constants import LOUTER
+from django.db.models.sql.where import WhereNode
 
 
 def as_sqlserver(expression):
@@ -59,12 +64,16 @@ def degrad(self, compiler, connection):
 
 @as_sqlserver(Greatest)
 def greatest(self, compiler, connection):
+    if connection.features.supports_greatest_least:
+        return self.as_sql(compiler, connection)
     template = '(SELECT MAX(value) FROM (VALUES (%(expressions)s)) AS _%(function)s(value))'
     return self.as_sql(compiler, connection, arg_joiner='), (', template=template)
 
 
 @as_sqlserver(Least)
 def least(self, compiler, connection):
+    if connection.features.supports_greatest_least:
+        return self.as_sql(compiler, connection)
     template = '(SELECT MIN(value) FROM (VALUES (%(expressions)s)) AS _%(function)s(value))'
     return self.as_sql(compiler, connection, arg_joiner='), (', template=template)
 
@@ -94,7 +103,8 @@ def lpad(self, compiler, connection):
 
 @as_sqlserver(Random)
 def random(self, compiler, connection):
-    return self.as_sql(compiler, connection, function='RAND')
+    # RAND() is evaluated once per query, seeding it with NEWID() makes it per row
+    return self.as_sql(compiler, connection, template='RAND(CHECKSUM(NEWID()))')
 
 
 @as_sqlserver(Repeat)
@@ -192,12 +202,17 @@ def orderby(self, compiler, connection, **extra):
         # sql server throws error "A constant expression was encountered in the ORDER BY" otherwise
         if isinstance(self.expression, RawSQL) and compiler._re_constant.match(self.expression.sql):
             return '%s %s' % (self.expression.sql, 'DESC' if self.descending else 'ASC'), ()
-        isnull = 0 if self.nulls_first else 1
-        isnotnull = 1 if self.nulls_first else 0
-        template = 'IIF(%%(expression)s IS NULL, %d, %d) ASC, %%(expression)s %%(ordering)s' % (isnull, isnotnull)
+        # sql server sorts nulls first in ascending order, the IIF (and the sort it implies) is only needed otherwise
+        natural = bool(self.nulls_first) != self.descending
+        not_null = isinstance(self.expression, Col) and _not_null_col(self.expression, compiler)
         copy = self.copy()
         copy.nulls_last = copy.nulls_first = False  # otherwise as_sql overwrites template
-        return copy.as_sql(compiler, connection, template=template, **extra)
+        if not (natural or not_null):
+            isnull = 0 if self.nulls_first else 1
+            isnotnull = 1 if self.nulls_first else 0
+            template = 'IIF(%%(expression)s IS NULL, %d, %d) ASC, %%(expression)s %%(ordering)s' % (isnull, isnotnull)
+            return copy.as_sql(compiler, connection, template=template, **extra)
+        self = copy
 
     if isinstance(self.expression, (CombinedExpression, BuiltinLookup, Exists)) and \
             not isinstance(self.expression, (DurationExpression,)) and \
@@ -211,9 +226,43 @@ def orderby(self, compiler, connection, **extra):
 
 @as_sqlserver(HasKeyLookup)
 def has_key_lookup(self, compiler, connection):
+    if connection.features.supports_json_path_exists:
+        return self.as_sql(compiler, connection, template="JSON_PATH_EXISTS(%s, %%s) = 1")
     return self.as_sql(compiler, connection, template="JSON_VALUE(%s,  %%s) IS NOT NULL")
 
 
+@as_sqlserver(KeyTransform)
+def key_transform(self, compiler, connection):
+    """ JSON_QUERY for objects and arrays, JSON_VALUE for scalars """
+    compiler.escape_if_noparams = True
+    lhs, params, key_transforms = self.preprocess_lhs(compiler, connection)
+    path = connection.ops.json_path_sql(key_transforms).replace('%', '%%')
+    return 'COALESCE(JSON_QUERY(%s, %s), JSON_VALUE(%s, %s))' % (lhs, path, lhs, path), (*params, *params)
+
+
+def _json_literal(value):
+    """ True if the text of a JSON number, true, false or null, which JSON_VALUE also returns unquoted """
+    try:
+        json.loads(value)
+    except ValueError:
+        return False
+    return True
+
+
+@as_sqlserver(KeyTransformExact)
+def key_transform_exact(self, compiler, connection):
+    """
+    strings are compared with the bare JSON_VALUE so that an index on a JSONKeyIndex computed column is used.
+    JSON_VALUE loses the type, a string which could be another scalar and other values keep the JSON comparison.
+    """
+    if isinstance(self.rhs, str) and not _json_literal(self.rhs) and isinstance(self.lhs, KeyTransform):
+        compiler.escape_if_noparams = True
+        lhs, params, key_transforms = self.lhs.preprocess_lhs(compiler, connection)
+        sql = connection.ops.json_value_sql(lhs, key_transforms).replace('%', '%%')
+        return '%s = %%s' % sql, (*params, self.rhs)
+    return self.as_sql(compiler, connection)
+
+
 @as_sqlserver(Window)
 def window(self, compiler, connection, **extra):
     if self.order_by is None and isinstance(self.source_expression, RowNumber):
@@ -223,10 +272,41 @@ def window(self, compiler, connection, **extra):
     return self.as_sql(compiler, connection, **extra)
 
 
+def _not_null_col(col, compiler):
+    """ True for a non nullable column of a table which is not outer joined """
+    join = compiler.query.alias_map.get(col.alias)
+    return not col.target.null and join is not None and getattr(join, 'join_type', None) != LOUTER
+
+
+def _never_null(expression, compiler):
+    """ True if the condition can only be true or false, never unknown (NULL) """
+    if isinstance(expression, Exists):
+        return True
+    if isinstance(expression, ExpressionWrapper):
+        return _never_null(expression.expression, compiler)
+    if isinstance(expression, WhereNode):
+        return all(_never_null(child, compiler) for child in expression.children)
+    if isinstance(expression, IsNull):
+        return True
+    if isinstance(expression, BuiltinLookup):
+        def not_null(side):
+            if isinstance(side, Col):
+                return _not_null_col(side, compiler)
+            return side is not None and not hasattr(side, 'resolve_expression')
+        return not_null(expression.lhs) and not_null(expression.rhs)
+    return False
+
+
 @as_sqlserver(Lookup)
 def lookup_fn(self, compiler, connection):
     # mostly copied from oracle
     compiler.escape_if_noparams = True
+    if isinstance(self, Exact) and isinstance(self.rhs, bool) and \
+            connection.ops.conditional_expression_supported_in_where_clause(self.lhs):
+        # sargable: "cond = True" is "cond", "cond = False" is "NOT cond" as long as cond is never unknown, otherwise
+        # CASE WHEN cond THEN 1 ELSE 0 END = 0 is also true for unknown
+        if self.rhs or _never_null(self.lhs, compiler):
+            return self.as_sql(compiler, connection)
     wrapped = False
     exprs = []
     for expr in (self.lhs, self.rhs):
@@ -236,3 +316,25 @@ def lookup_fn(self, compiler, connection):
         exprs.append(expr)
     lookup = type(self)(*exprs) if wrapped else self
     return lookup.as_sql(compiler, connection)
+
+
+@as_sqlserver(DurationExpression)
+def duration_expression(self, compiler, connection, **extra):
+    """ inline DATEADD instead of dbo.django_dtdelta. The duration is repeated in the sql so are its params """
+    if self.connector not in ('+', '-'):
+        raise DatabaseError('Invalid connector for timedelta: %s.' % self.connector)
+    compiler.escape_if_noparams = True
+    lhs, rhs = self.lhs, self.rhs
+    if lhs.output_field.get_internal_type() == 'DurationField':
+        if self.connector == '-':
+            raise DatabaseError('Cannot subtract a temporal value from a duration.')
+        lhs, rhs = rhs, lhs
+    temporal_type = lhs.output_field.get_internal_type()
+    temporal_sql, temporal_params = compiler.compile(lhs)
+    duration_sql, duration_params = compiler.compile(rhs)
+    if temporal_type != 'DateTimeField':
+        temporal_sql = 'CAST(%s AS DATETIME2)' % temporal_sql
+    sql = connection.ops.combine_duration_expression(self.connector, [temporal_sql, duration_sql])
+    if temporal_type == 'TimeField':
+        sql = 'CAST(%s AS TIME)' % sql
+    return '(%s)' % sql, (*duration_params, *duration_params, *duration_params, *temporal_params)
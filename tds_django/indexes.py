@@ -0,0 +1,133 @@
+from django.db.models import Index
+
+
+class FullTextIndex(Index):
+    """
+    Full-text index on the fields, keyed by the primary key. SQL Server allows one per table and neither the catalog
+    nor the index can be created in a transaction: the migration needs `atomic = False`.
+    """
+    suffix = 'fts'
+
+    def __init__(self, *, fields, name, catalog='django_fulltext', language=None):
+        super().__init__(fields=fields, name=name)
+        self.catalog = catalog
+        self.language = language
+
+    def create_sql(self, model, schema_editor, using='', **kwargs):
+        fields = [model._meta.get_field(field_name) for field_name, _ in self.fields_orders]
+        return schema_editor._create_fulltext_index_sql(model, fields, self.catalog, self.language)
+
+    def remove_sql(self, model, schema_editor, **kwargs):
+        return schema_editor._delete_fulltext_index_sql(model)
+
+    def deconstruct(self):
+        path, args, kwargs = super().deconstruct()
+        kwargs['catalog'] = self.catalog
+        if self.language is not None:
+            kwargs['language'] = self.language
+        return path, args, kwargs
+
+
+class ColumnstoreIndex(Index):
+    """
+    Columnstore index for batch mode scans over large tables. A clustered one stores the whole table and takes no
+    fields, the primary key of the model is then created nonclustered: it has to be declared with the model.
+    A nonclustered one covers the fields and accepts a condition.
+    """
+    suffix = 'columnstore'
+
+    def __init__(self, *, name, fields=(), clustered=False, condition=None, data_compression=None):
+        if clustered and (fields or condition):
+            raise ValueError('A clustered ColumnstoreIndex covers the whole table, it accepts no fields or condition.')
+        if not clustered and not fields:
+            raise ValueError('A nonclustered ColumnstoreIndex requires fields.')
+        # Index requires fields
+        super().__init__(fields=fields or ['pk'], name=name, condition=condition)
+        if clustered:
+            self.fields, self.fields_orders = [], []
+        self.clustered = clustered
+        self.data_compression = data_compression
+
+    def create_sql(self, model, schema_editor, using='', **kwargs):
+        fields = [model._meta.get_field(field_name) for field_name, _ in self.fields_orders]
+        return schema_editor._create_index_sql(
+            model, fields=fields, name=self.name, condition=self._get_condition_sql(model, schema_editor),
+            columnstore='CLUSTERED' if self.clustered else 'NONCLUSTERED', data_compression=self.data_compression)
+
+    def deconstruct(self):
+        path, args, kwargs = super().deconstruct()
+        if not kwargs.get('fields'):
+            kwargs.pop('fields', None)
+        if self.clustered:
+            kwargs['clustered'] = True
+        if self.data_compression:
+            kwargs['data_compression'] = self.data_compression
+        return path, args, kwargs
+
+
+class CompressedIndex(Index):
+    """
+    Index with a DATA_COMPRESSION option, ROW or PAGE, or a {partition number: compression} dict for a partitioned
+    table.
+    """
+    def __init__(self, *args, data_compression, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.data_compression = data_compression
+
+    def create_sql(self, model, schema_editor, using='', **kwargs):
+        return super().create_sql(model, schema_editor, using=using, data_compression=self.data_compression, **kwargs)
+
+    def deconstruct(self):
+        path, args, kwargs = super().deconstruct()
+        kwargs['data_compression'] = self.data_compression
+        return path, args, kwargs
+
+
+class HashIndex(Index):
+    """
+    Hash index of a memory optimized table for equality lookups on all its fields, bucket_count should be one to two
+    times the number of distinct keys.
+    """
+    suffix = 'hash'
+
+    def __init__(self, *, fields, name, bucket_count):
+        super().__init__(fields=fields, name=name)
+        self.bucket_count = bucket_count
+
+    def create_sql(self, model, schema_editor, using='', **kwargs):
+        fields = [model._meta.get_field(field_name) for field_name, _ in self.fields_orders]
+        return schema_editor._create_index_sql(model, fields=fields, name=self.name, bucket_count=self.bucket_count)
+
+    def deconstruct(self):
+        path, args, kwargs = super().deconstruct()
+        kwargs['bucket_count'] = self.bucket_count
+        return path, args, kwargs
+
+
+class JSONKeyIndex(Index):
+    """
+    Index on a key of a JSONField through a persisted computed column (named after the index by default), so that
+    field__key=value compiles to the same JSON_VALUE expression and seeks on the index.
+    keys is the path, ie ['customer', 'id'] for field__customer__id.
+    """
+    suffix = 'json'
+
+    def __init__(self, *, field, keys, name, column=None):
+        super().__init__(fields=[field], name=name)
+        self.keys = [str(key) for key in keys]
+        self.column = column or name
+
+    def create_sql(self, model, schema_editor, using='', **kwargs):
+        field = model._meta.get_field(self.fields[0])
+        return schema_editor._create_json_key_index_sql(model, field, self.keys, self.column, self.name)
+
+    def remove_sql(self, model, schema_editor, **kwargs):
+        return schema_editor._delete_json_key_index_sql(model, self.column, self.name)
+
+    def deconstruct(self):
+        path, args, kwargs = super().deconstruct()
+        kwargs['field'] = kwargs.pop('fields')[0]
+        kwargs['keys'] = self.keys
+        if self.column != self.name:
+            kwargs['column'] = self.column
+        return path, args, kwargs
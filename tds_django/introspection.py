@@ -3,6 +3,7 @@ from django.db.backends.base.introspection import BaseDatabaseIntrospection, Tab
 
 from django.db.models.indexes import Index
 
+from tds_django.indexes import ColumnstoreIndex, HashIndex
 from tds_django.sql.queries import Introspection
 
 FieldInfo = namedtuple('FieldInfo', BaseFieldInfo._fields + ('identity', 'seed', 'increment',))
@@ -20,6 +21,10 @@ class DatabaseIntrospection(BaseDatabaseIntrospection):
 
     ignored_tables = []
 
+    # sys.indexes.type, others are reported by their type_desc
+    _index_types = {1: Index.suffix, 2: Index.suffix, 5: ColumnstoreIndex.suffix, 6: ColumnstoreIndex.suffix,
+                    7: HashIndex.suffix}
+
     def get_field_type(self, data_type, description):
         field_type = super().get_field_type(data_type, description)
         if description.identity:
@@ -115,6 +120,7 @@ class DatabaseIntrospection(BaseDatabaseIntrospection):
             # Record the details
             constraints[constraint]['columns'].append(column)
         # indices
+        data_compression = self.get_data_compression(cursor, table_name)
         cursor.execute(Introspection.get_indices, (table_name, ))
         indices = {}
         for name, unique, primary, type_, desc, order, has_filter, filter_definition, column in cursor.fetchall():
@@ -129,7 +135,8 @@ class DatabaseIntrospection(BaseDatabaseIntrospection):
                     'has_filter': has_filter,
                     'filter_definition': filter_definition,
                     'orders': [],
-                    'type': Index.suffix if type_ in (1, 2) else desc.lower(),
+                    'type': self._index_types.get(type_) or desc.lower(),
+                    'data_compression': data_compression.get(name),
                 }
             indices[name]['columns'].append(column)
             indices[name]['orders'].append('DESC' if order == 1 else 'ASC')
@@ -138,6 +145,26 @@ class DatabaseIntrospection(BaseDatabaseIntrospection):
                 constraints[name] = constraint
         return constraints
 
+    def get_data_compression(self, cursor, table_name):
+        """
+        {index name: compression} as declared on the models: None, the compression or a {partition: compression} dict.
+        The table itself (heap or clustered index) is under None.
+        """
+        cursor.execute(Introspection.get_data_compression, (table_name, ))
+        partitions = {}
+        for name, index_id, partition, compression in cursor.fetchall():
+            partitions.setdefault(name, {})[partition] = compression
+            if index_id in (0, 1):
+                partitions[None] = partitions[name]
+        result = {}
+        for name, compressions in partitions.items():
+            if len(set(compressions.values())) > 1:
+                result[name] = compressions
+            else:
+                compression = next(iter(compressions.values()))
+                result[name] = None if compression == 'NONE' else compression
+        return result
+
     def get_table_defaults(self, cursor, table_name):
         cursor.execute(Introspection.get_default, (table_name, ))
         return {line[0]: line[1:] for line in cursor.fetchall()}
@@ -1,14 +1,22 @@
+import logging
 import re
+import time
+from decimal import Decimal
+
 from django.conf import settings
 from django.db import DatabaseError, OperationalError
 from django.db.backends.base.operations import BaseDatabaseOperations
+from django.db.backends import utils
 from django.db.models import Exists, ExpressionWrapper, Lookup
-from django.db.models.expressions import RawSQL
+from django.db.models.expressions import Col, RawSQL
+from django.db.models.fields.json import compile_json_path
 from django.db.models.sql.where import WhereNode
 from django.utils import timezone
 
 from tds_django.sql.queries import Introspection
-from .tz import iana_win_map
+from .tz import windows_zone
+
+logger = logging.getLogger('django.db.backends')
 
 
 class DatabaseOperations(BaseDatabaseOperations):
@@ -16,6 +24,9 @@ class DatabaseOperations(BaseDatabaseOperations):
     compiler_module = 'tds_django.compiler'
     # explain_prefix = 'SET SHOWPLAN_XML ON;'
     _re_utc_offset = re.compile(r'^utc[+-]', re.IGNORECASE)
+    _flush_graph_cache = None
+    # tzname -> (prefix, suffix) of the sql converting to this timezone
+    _tz_fragments = {}
 
     def savepoint_create_sql(self, sid):
         return 'SAVE TRANSACTION %s' % self.quote_name(sid)
@@ -24,21 +35,24 @@ class DatabaseOperations(BaseDatabaseOperations):
         return 'ROLLBACK TRANSACTION %s' % self.quote_name(sid)
 
     def _prepare_tzname_delta(self, tzname):
+        windows = windows_zone(tzname)
+        if windows:
+            return windows
         if '/' in tzname:
-            t = iana_win_map.get(tzname, False)
-            if not t:
-                raise ValueError(f"Invalid TimeZone {tzname}")
-            return t
+            raise ValueError(f"Invalid TimeZone {tzname}")
         elif self._re_utc_offset.match(tzname):
             return tzname[3:]
         return tzname
 
     def _sql_tz(self, sql, params, tzname):
-        tzname = self._prepare_tzname_delta(tzname)
-        if tzname[0] in '+-':
-            return f"SWITCHOFFSET({sql}, '{tzname}')", params
-        else:
-            return f"{sql} AT TIME ZONE '{tzname}'", params
+        if tzname not in self._tz_fragments:
+            name = self._prepare_tzname_delta(tzname)
+            if name[0] in '+-':
+                self._tz_fragments[tzname] = ('SWITCHOFFSET(', f", '{name}')")
+            else:
+                self._tz_fragments[tzname] = ('', f" AT TIME ZONE '{name}'")
+        prefix, suffix = self._tz_fragments[tzname]
+        return prefix + sql + suffix, params
 
     def _convert_sql_to_tz(self, sql, params, tzname):
         if tzname and settings.USE_TZ and self.connection.timezone_name != tzname:
@@ -62,7 +76,18 @@ class DatabaseOperations(BaseDatabaseOperations):
         sql, params = self._convert_sql_to_tz(sql, params, tzname)
         return f'CAST({sql} AS DATE)', params
 
+    @staticmethod
+    def _datetrunc_sql(lookup_type, sql, data_type):
+        """ DATETRUNC returns the type of its argument, django weeks start on monday """
+        datepart = {'week': 'iso_week', 'weekday': 'day'}.get(lookup_type.lower(), lookup_type.lower())
+        return f'DATETRUNC({datepart}, CAST({sql} AS {data_type}))'
+
     def date_trunc_sql(self, lookup_type, sql, params, tzname=None):
+        if self.connection.features.supports_datetrunc:
+            sql, params = self._convert_sql_to_tz(sql, params, tzname)
+            if not lookup_type.lower() in 'year quarter month dayofyear day weekday week'.split():
+                raise OperationalError(f'Lookup {lookup_type} not supported.')
+            return self._datetrunc_sql(lookup_type, sql, 'DATE'), params
         sql, params = self.datetime_trunc_sql(lookup_type, sql, params, tzname)
         return f'CAST({sql} AS DATE)', params
 
@@ -70,6 +95,8 @@ class DatabaseOperations(BaseDatabaseOperations):
         sql, params = self._convert_sql_to_tz(sql, params, tzname)
         if not lookup_type.lower() in 'year quarter month dayofyear day weekday hour minute week second'.split():
             raise OperationalError(f'Lookup {lookup_type} not supported.')
+        if self.connection.features.supports_datetrunc:
+            return self._datetrunc_sql(lookup_type, sql, 'DATETIME2'), params
         return f"dbo.django_datetime_trunc('{lookup_type}', {sql})", params
 
     def datetime_cast_time_sql(self, sql, params, tzname):
@@ -85,6 +112,8 @@ class DatabaseOperations(BaseDatabaseOperations):
             'second': r'hh\:mm\:ss',
         }
         if lookup_type in fields:
+            if self.connection.features.supports_datetrunc:
+                return self._datetrunc_sql(lookup_type, sql, 'TIME'), params
             return f"CAST(FORMAT(CAST({sql} AS TIME), '{fields[lookup_type]}') AS TIME)", params
         else:
             return f'CAST({sql} as TIME)', params
@@ -103,58 +132,207 @@ class DatabaseOperations(BaseDatabaseOperations):
         values_sql = ", ".join("(%s)" % sql for sql in placeholder_rows_sql)
         return "VALUES " + values_sql
 
+    def _flush_graph(self):
+        """ FK graph, identity seeds and memory optimized tables of the schema, cached until the schema changes """
+        with self.connection.cursor() as cursor:
+            cursor.execute(Introspection.schema_version)
+            version = tuple(cursor.fetchone())
+            if self._flush_graph_cache is None or self._flush_graph_cache[0] != version:
+                cursor.execute(Introspection.get_fks)
+                fks = {(a, b): (c, d) for a, b, c, d in cursor.fetchall()}
+                cursor.execute(Introspection.get_identities)
+                identities = dict(cursor.fetchall())
+                cursor.execute(Introspection.get_memory_optimized)
+                memory_optimized = {row[0] for row in cursor.fetchall()}
+                self._flush_graph_cache = (version, fks, identities, memory_optimized)
+        return self._flush_graph_cache[1:]
+
+    @staticmethod
+    def _flush_order(tables, fks):
+        """
+        Order tables so that a table is emptied before the tables it references.
+        Returns the ordered tables and the ones left in (or behind) a cycle.
+        """
+        references = {t: set() for t in tables}
+        for (s, _), (t, _) in fks.items():
+            if s != t and s in references and t in references:
+                references[s].add(t)
+        referenced_by = {t: 0 for t in tables}
+        for targets in references.values():
+            for t in targets:
+                referenced_by[t] += 1
+        todo = [t for t in tables if not referenced_by[t]]
+        ordered = []
+        while todo:
+            table = todo.pop(0)
+            ordered.append(table)
+            for t in references[table]:
+                referenced_by[t] -= 1
+                if not referenced_by[t]:
+                    todo.append(t)
+        done = set(ordered)
+        return ordered, [t for t in tables if t not in done]
+
+    @staticmethod
+    def _flush_cascade(tables, fks):
+        """ (table, column) of rows referencing flushed tables, deepest first """
+        referencing = {}
+        for (s, k), (t, c) in fks.items():
+            if s not in tables:
+                referencing.setdefault(t, []).append((s, k, c))
+        todo = [(t, None) for t in tables]
+        cascade = []
+        while todo:
+            table, column = todo.pop(0)
+            for s, k, c in referencing.get(table, ()):
+                if (column is None or c == column) and (s, k) not in cascade:
+                    cascade.append((s, k))
+                    todo.append((s, k))
+        return cascade[::-1]
+
     def sql_flush(self, style, tables, *, reset_sequences=False, allow_cascade=False):
+        """
+        Tables are emptied in FK order so constraints only need to be disabled for tables in a cycle.
+        TRUNCATE is used for tables no FK references, as long as resetting their identity is expected. Memory optimized
+        tables support neither TRUNCATE nor reseeding.
+        Everything is sent as one batch.
+        """
         if not tables:
             return []
-        sql = ['EXEC sp_MSforeachtable "ALTER TABLE ? NOCHECK CONSTRAINT ALL"']
-
+        fks, identities, memory_optimized = self._flush_graph()
+        sql = []
         if allow_cascade:
-            with self.connection.cursor() as cursor:
-                cursor.execute(Introspection.get_fks)
-                m = {(a, b): (c, d) for a, b, c, d in cursor.fetchall()}
-                cols_to_del = set()
-                while True:
-                    newm = {}
-                    for (s, k), (t, c) in m.items():
-                        if t in tables or (t, c) in cols_to_del:
-                            sql.append('DELETE FROM %s WHERE %s IS NOT NULL' % (self.quote_name(s),
-                                                                                  self.quote_name(k)))
-                            cols_to_del.add((s, k))
-                        else:
-                            newm[(s, k)] = (t, c)
-                    if len(newm) == len(m):
-                        break
-                    m = newm
-
-        sql.extend(
-            '%s %s %s;' % (
+            sql.extend(
+                'DELETE FROM %s WHERE %s IS NOT NULL' % (self.quote_name(s), self.quote_name(k))
+                for s, k in self._flush_cascade(set(tables), fks)
+            )
+
+        ordered, cyclic = self._flush_order(tables, fks)
+        sql.extend('ALTER TABLE %s NOCHECK CONSTRAINT ALL' % self.quote_name(t) for t in cyclic)
+        referenced = {t for t, _ in fks.values()}
+        for table_name in ordered + cyclic:
+            if table_name in memory_optimized:
+                sql.append('%s %s %s' % (
+                    style.SQL_KEYWORD('DELETE'),
+                    style.SQL_KEYWORD('FROM'),
+                    style.SQL_FIELD(self.quote_name(table_name)),
+                ))
+                continue
+            if table_name not in referenced and (reset_sequences or table_name not in identities):
+                sql.append('%s %s %s' % (
+                    style.SQL_KEYWORD('TRUNCATE'),
+                    style.SQL_KEYWORD('TABLE'),
+                    style.SQL_FIELD(self.quote_name(table_name)),
+                ))
+                continue
+            sql.append('%s %s %s' % (
                 style.SQL_KEYWORD('DELETE'),
                 style.SQL_KEYWORD('FROM'),
                 style.SQL_FIELD(self.quote_name(table_name)),
-            ) for table_name in tables
-        )
-        if reset_sequences:
-            qids = Introspection.get_identities % \
-                   ', '.join('%s' for _ in tables)
-            with self.connection.cursor() as cursor:
-                cursor.execute(qids, tuple(tables))
-                for t, i in cursor.fetchall():
-                    sql.append('DBCC CHECKIDENT (%s, RESEED, %d)' % (self.quote_name(t), i))
-
-        sql += ['EXEC sp_MSforeachtable "ALTER TABLE ? WITH CHECK CHECK CONSTRAINT ALL";']
-        return sql
+            ))
+            if reset_sequences and table_name in identities:
+                sql.append('DBCC CHECKIDENT (%s, RESEED, %d)' % (self.quote_name(table_name),
+                                                                  identities[table_name]))
+        sql.extend('ALTER TABLE %s WITH CHECK CHECK CONSTRAINT ALL' % self.quote_name(t) for t in cyclic)
+        return [';\n'.join(sql) + ';']
+
+    def execute_sql_flush(self, sql_list):
+        """ restore the test database snapshot instead of flushing if enabled, see DatabaseCreation """
+        start = time.monotonic()
+        if self.connection.creation.restore_snapshot():
+            logger.debug('(%.3f) test database restored from snapshot', time.monotonic() - start)
+            return
+        super().execute_sql_flush(sql_list)
+        logger.debug('(%.3f) flushed', time.monotonic() - start)
 
     def get_db_converters(self, expression):
         converters = super().get_db_converters(expression)
         internal_type = expression.output_field.get_internal_type()
         if internal_type == 'DateTimeField':
-            converters.append(self.convert_datetimefield_value)
+            if settings.USE_TZ:
+                converters.append(self.convert_datetimefield_value)
+        elif isinstance(expression, Col):
+            # FLOAT and BIT columns are already decoded as float and bool by pytds
+            pass
         elif internal_type == 'FloatField':
             converters.append(self.convert_floatfield_value)
         elif internal_type in ('BooleanField', 'NullBooleanField'):
             converters.append(self.convert_booleanfield_value)
         return converters
 
+    def get_value_converter(self, converters, expression):
+        """
+        Fuse the converters of a column into a single function of the value.
+        Our own converters are replaced by versions that do not need the expression nor the connection.
+        """
+        connection = self.connection
+        fast = {
+            self.convert_datetimefield_value: self._datetime_converter,
+            self.convert_floatfield_value: self._float_converter,
+            self.convert_booleanfield_value: self._boolean_converter,
+        }
+
+        def generic(converter):
+            return lambda value: converter(value, expression, connection)
+
+        functions = [fast[c]() if c in fast else generic(c) for c in converters]
+        if len(functions) == 1:
+            return functions[0]
+
+        def convert(value):
+            for f in functions:
+                value = f(value)
+            return value
+        return convert
+
+    def get_column_converter(self, converters, expression):
+        """ The fused converter of a column applied to a sequence of values, see QuerySet.fetch_columns. """
+        convert = self.get_value_converter(converters, expression)
+
+        def convert_column(values):
+            return list(map(convert, values))
+        return convert_column
+
+    def get_row_converter(self, converters):
+        """ Fuse the converters of a query into a single function applied to each row. """
+        columns = [
+            (pos, self.get_value_converter(convs, expression))
+            for pos, (convs, expression) in converters.items()
+        ]
+
+        def convert_row(row):
+            row = list(row)
+            for pos, f in columns:
+                row[pos] = f(row[pos])
+            return row
+        return convert_row
+
+    def _datetime_converter(self):
+        tz = self.connection.timezone
+        if hasattr(tz, 'localize'):  # pytz
+            make_aware = tz.localize
+        else:
+            def make_aware(value):
+                return value.replace(tzinfo=tz)
+
+        def convert(value):
+            if value is not None and value.tzinfo is None:
+                return make_aware(value)
+            return value
+        return convert
+
+    def _float_converter(self):
+        def convert(value):
+            if value is None or type(value) is float:
+                return value
+            return float(value)
+        return convert
+
+    def _boolean_converter(self):
+        def convert(value):
+            return bool(value) if value in (0, 1) else value
+        return convert
+
     def convert_datetimefield_value(self, value, expression, connection):
         if value is not None:
             if settings.USE_TZ and not timezone.is_aware(value):
@@ -228,9 +406,11 @@ class DatabaseOperations(BaseDatabaseOperations):
         if connector == '^':
             return 'POWER(CAST(%s AS FLOAT), %s)' % tuple(sub_expressions)
         elif connector == '<<':
-            return 'dbo.django_bitshift(%s, -1 * %s, 0)' % tuple(sub_expressions)
+            return '(%s * POWER(CAST(2 AS BIGINT), %s))' % tuple(sub_expressions)
         elif connector == '>>':
-            return 'dbo.django_bitshift(%s, %s, 0)' % tuple(sub_expressions)
+            # FLOOR as integer division rounds toward zero for negative numbers
+            return 'CAST(FLOOR(CAST(%s AS DECIMAL(38, 0)) / POWER(CAST(2 AS DECIMAL(38, 0)), %s)) AS BIGINT)' % \
+                tuple(sub_expressions)
         elif connector == '#':
             return super().combine_expression('^', sub_expressions)
         return super().combine_expression(connector, sub_expressions)
@@ -241,18 +421,22 @@ class DatabaseOperations(BaseDatabaseOperations):
         return f'DATEDIFF_BIG(microsecond, {rhs_sql}, {lhs_sql})', (*rhs_params, *lhs_params)
 
     def combine_duration_expression(self, connector, sub_expressions):
+        """
+        sub_expressions are (temporal, duration in microseconds). DATEADD only accepts INT so the duration is
+        split into days, milliseconds and microseconds. The duration sql is used 3 times before the temporal sql.
+        """
         if connector not in ['+', '-',]:
             raise DatabaseError('Invalid connector for timedelta: %s.' % connector)
-        lhs, rhs = sub_expressions
+        temporal, duration = sub_expressions
         sign = '-' if connector == '-' else ''
-        if lhs.startswith('dbo'):
-            col, sql = rhs, lhs
-        else:
-            col, sql = lhs, rhs
-        return sql.format(col, sign)
+        return (
+            f'DATEADD(MICROSECOND, {sign}(({duration}) %% 1000), '
+            f'DATEADD(MILLISECOND, {sign}((({duration}) / 1000) %% 86400000), '
+            f'DATEADD(DAY, {sign}(({duration}) / 86400000000), {temporal})))'
+        )
 
     def format_for_duration_arithmetic(self, sql):
-        return 'dbo.django_dtdelta({}, {}%s)' % sql
+        return sql
 
     def adapt_timefield_value(self, value):
         if value is None:
@@ -283,6 +467,11 @@ class DatabaseOperations(BaseDatabaseOperations):
 
         return value
 
+    def adapt_decimalfield_value(self, value, max_digits=None, decimal_places=None):
+        """ a Decimal, declared by CursorWrapper """
+        value = utils.format_number(value, max_digits, decimal_places)
+        return None if value is None else Decimal(value)
+
     def bulk_batch_size(self, fields, objs):
         if fields:
             return self.connection.features.max_query_params // len(fields)
@@ -311,3 +500,12 @@ class DatabaseOperations(BaseDatabaseOperations):
         if lookup_type == 'regex':
             return 'dbo.django_regex(%s, %s) = 1'
         return 'dbo.django_iregex(%s, %s) = 1'
+
+    def json_path_sql(self, key_transforms):
+        """
+        JSON path as a literal: computed columns (see JSONKeyIndex) are only matched by an identical expression
+        """
+        return self.connection.SchemaEditorClass.quote_value(compile_json_path(key_transforms))
+
+    def json_value_sql(self, sql, key_transforms):
+        return 'JSON_VALUE(%s, %s)' % (sql, self.json_path_sql(key_transforms))
@@ -0,0 +1,69 @@
+import json
+
+from django.core import signing
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F
+
+from .patches import _seek_ordering
+
+
+class _CursorSerializer(signing.JSONSerializer):
+    def dumps(self, obj):
+        return json.dumps(obj, cls=DjangoJSONEncoder, separators=(',', ':')).encode('latin-1')
+
+
+class KeysetPage:
+    def __init__(self, object_list, next_cursor):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+
+class KeysetPaginator:
+    """
+    Paginate with QuerySet.seek instead of OFFSET, the cost of a page does not depend on its depth.
+    Pages are reached through the signed cursor of the previous page.
+    """
+    salt = 'tds_django.pagination.KeysetPaginator'
+
+    def __init__(self, queryset, per_page, ordering=None):
+        if ordering:
+            queryset = queryset.order_by(*ordering)
+        # the values of the ordering, related ones included, are selected along the rows
+        names = [name for name, _ in _seek_ordering(queryset)]
+        self.keys = ['_keyset_%d' % i for i in range(len(names))]
+        self.queryset = queryset.annotate(**{key: F(name) for key, name in zip(self.keys, names)})
+        self.per_page = int(per_page)
+
+    @classmethod
+    def encode_cursor(cls, values):
+        return signing.dumps(values, salt=cls.salt, serializer=_CursorSerializer)
+
+    @classmethod
+    def decode_cursor(cls, cursor):
+        try:
+            return signing.loads(cursor, salt=cls.salt, serializer=_CursorSerializer)
+        except (signing.BadSignature, ValueError):
+            raise ValueError('Invalid cursor.')
+
+    def page(self, cursor=None):
+        """ first page if cursor is None, otherwise the page following the one the cursor was returned with """
+        qs = self.queryset if cursor is None else self.queryset.seek(self.decode_cursor(cursor))
+        objects = list(qs[:self.per_page + 1])  # TOP n + 1
+        next_cursor = None
+        if len(objects) > self.per_page:
+            objects = objects[:self.per_page]
+            last = objects[-1]
+            next_cursor = self.encode_cursor([getattr(last, key) for key in self.keys])
+        return KeysetPage(objects, next_cursor)
@@ -0,0 +1,28 @@
+from django.utils.deconstruct import deconstructible
+
+
+@deconstructible(path='tds_django.partitioning.Partitioning')
+class Partitioning:
+    """
+    Range partitioning of a table on field, declared with TableOptions(partitioning=...). The partition function and
+    scheme are created with the first table using them and are named after the table unless given.
+    """
+
+    def __init__(self, field, boundaries, *, function=None, scheme=None, range='RIGHT', filegroup='PRIMARY'):
+        if range not in ('LEFT', 'RIGHT'):
+            raise ValueError("Partitioning range is either 'LEFT' or 'RIGHT'.")
+        self.field = field
+        self.boundaries = list(boundaries)
+        self.function = function
+        self.scheme = scheme
+        self.range = range
+        self.filegroup = filegroup
+
+    def function_name(self, model):
+        return self.function or '%s_pf' % model._meta.db_table
+
+    def scheme_name(self, model):
+        return self.scheme or '%s_ps' % model._meta.db_table
+
+    def __eq__(self, other):
+        return isinstance(other, Partitioning) and self.deconstruct() == other.deconstruct()
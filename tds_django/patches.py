@@ -1,5 +1,16 @@
+from array import array
+
+from django.core.exceptions import EmptyResultSet
+from django.db.models import Q
+from django.db.models.manager import Manager
 from django.db.models.query import QuerySet
-from django.db import connections
+from django.db.models.sql.constants import GET_ITERATOR_CHUNK_SIZE
+from django.db import connections, NotSupportedError
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 
 _bulk = QuerySet.bulk_update
@@ -52,3 +63,153 @@ def bulk_update(self, objs, fields, batch_size=None):
 bulk_update.alters_data = True
 
 setattr(QuerySet, 'bulk_update', bulk_update)
+
+
+# typecode of the array.array used to buffer numeric columns, anything else is kept in a list
+_column_typecodes = {
+    'AutoField': 'q',
+    'BigAutoField': 'q',
+    'BigIntegerField': 'q',
+    'IntegerField': 'q',
+    'PositiveBigIntegerField': 'q',
+    'PositiveIntegerField': 'q',
+    'PositiveSmallIntegerField': 'q',
+    'SmallAutoField': 'q',
+    'SmallIntegerField': 'q',
+    'FloatField': 'd',
+}
+
+
+def _extend_column(column, values):
+    """ extend the buffer of a column, falling back to a list if values do not fit in the array (NULL) """
+    if isinstance(column, array):
+        length = len(column)
+        try:
+            column.extend(values)
+            return column
+        except TypeError:
+            del column[length:]
+            column = column.tolist()
+    column.extend(values)
+    return column
+
+
+def _finalize_column(column, internal_type):
+    if numpy is None:
+        return column
+    if isinstance(column, array):
+        # zero copy
+        return numpy.frombuffer(column, dtype=numpy.int64 if column.typecode == 'q' else numpy.float64)
+    if internal_type == 'DateField':
+        return numpy.array(column, dtype='datetime64[D]')
+    if internal_type == 'DateTimeField' and not any(v is not None and v.tzinfo is not None for v in column):
+        return numpy.array(column, dtype='datetime64[us]')
+    result = numpy.empty(len(column), dtype=object)
+    result[:] = column
+    return result
+
+
+def fetch_columns(self, *fields, chunk_size=GET_ITERATOR_CHUNK_SIZE):
+    """
+    Return a dict {name: column} of the selected fields (same arguments as values_list).
+    Numeric columns are array.array, or NumPy arrays sharing the same buffer if NumPy is installed (dates as
+    datetime64, others as object arrays). Rows are fetched chunk_size at a time from the open cursor and transposed
+    into the columns, they are never kept as a whole.
+    """
+    if connections[self.db].vendor != 'sqlserver':
+        raise NotSupportedError('fetch_columns() is only supported on SQL Server.')
+    qs = self.values_list(*fields)
+    query = qs.query
+    names = [*query.extra_select, *query.values_select, *query.annotation_select]
+    compiler = query.get_compiler(qs.db)
+    try:
+        sql, params = compiler.as_sql()
+    except EmptyResultSet:
+        sql = None
+    expressions = [s[0] for s in compiler.select[0:compiler.col_count]]
+    internal_types = [e.output_field.get_internal_type() for e in expressions]
+    ops = compiler.connection.ops
+    converters = {
+        pos: ops.get_column_converter(convs, expression)
+        for pos, (convs, expression) in compiler.get_converters(expressions).items()
+    }
+    columns = [array(_column_typecodes[t]) if t in _column_typecodes else [] for t in internal_types]
+    if sql is not None:
+        # the compiler would fetch all the rows first, can_use_chunked_reads is False
+        with compiler.connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                for pos, values in enumerate(zip(*rows)):
+                    if pos in converters:
+                        values = converters[pos](values)
+                    columns[pos] = _extend_column(columns[pos], values)
+    return {name: _finalize_column(column, t) for name, column, t in zip(names, columns, internal_types)}
+
+
+setattr(QuerySet, 'fetch_columns', fetch_columns)
+
+
+def sample(self, n=None, percent=None, seed=None):
+    """
+    Random subset of the queryset.
+    percent: TABLESAMPLE of the model table, cheap on large tables as whole pages are picked, hence approximate.
+    The same seed returns the same sample as long as the table does not change.
+    n: n random rows (ORDER BY NEWID() with TOP n), combined with percent only the sample is sorted.
+    """
+    if connections[self.db].vendor != 'sqlserver':
+        raise NotSupportedError('sample() is only supported on SQL Server.')
+    if n is None and percent is None:
+        raise ValueError('sample() needs n or percent.')
+    qs = self._chain()
+    if percent is not None:
+        if not 0 < percent <= 100:
+            raise ValueError('percent must be between 0 and 100.')
+        qs.query.tablesample = (percent, seed)
+    if n is not None:
+        qs = qs.order_by('?')[:n]
+    return qs
+
+
+setattr(QuerySet, 'sample', sample)
+
+
+def _seek_ordering(qs):
+    """ [(field name, descending)] of the explicit ordering of the queryset """
+    if not qs.query.order_by:
+        raise ValueError('seek() needs an explicit ordering ending with a unique field.')
+    ordering = []
+    for name in qs.query.order_by:
+        if not isinstance(name, str) or name == '?':
+            raise ValueError('seek() only supports ordering by field names.')
+        ordering.append((name.lstrip('-'), name.startswith('-')))
+    return ordering
+
+
+def seek(self, after):
+    """
+    Rows following `after`, the values of the ordering fields of the last row of the previous page.
+    The predicate is expanded as (a > x) OR (a = x AND b > y)... with a leading a >= x so SQL Server can seek on an
+    index matching the ordering. Ordering fields must be non nullable and the last one unique (ie pk).
+    """
+    ordering = _seek_ordering(self)
+    if len(after) != len(ordering):
+        raise ValueError('seek() needs one value per ordering field.')
+    chain = Q()
+    for i, (name, descending) in enumerate(ordering):
+        condition = Q(**{'%s__%s' % (name, 'lt' if descending else 'gt'): after[i]})
+        for j, (previous, _) in enumerate(ordering[:i]):
+            condition &= Q(**{previous: after[j]})
+        chain |= condition
+    name, descending = ordering[0]
+    return self.filter(Q(**{'%s__%s' % (name, 'lte' if descending else 'gte'): after[0]}) & chain)
+
+
+setattr(QuerySet, 'seek', seek)
+
+
+# Manager copied the QuerySet methods when django.db.models was imported, the new ones are added the same way
+for name, method in Manager._get_queryset_methods(QuerySet).items():
+    setattr(Manager, name, method)
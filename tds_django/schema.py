@@ -1,14 +1,23 @@
 import binascii
 import datetime
 import copy
+import logging
+import re
 
-from django.db.backends.utils import strip_quotes
+from django.db.backends.utils import names_digest, strip_quotes
 from django.apps.registry import Apps
+from django.db import NotSupportedError
 from django.db.backends.base.schema import BaseDatabaseSchemaEditor, _related_non_m2m_objects
+from django.db.models import F
+from django.db.models.expressions import OrderBy
+from django.db.models.sql import Query
 from django.utils.encoding import force_str
-from django.db.backends.ddl_references import Statement
+from django.db.backends.ddl_references import Columns, Statement, Table
 
-from tds_django.sql.queries import Misc
+from tds_django.constraints import TableOptions
+from tds_django.sql.queries import Introspection, Misc
+
+logger = logging.getLogger('django.db.backends.schema')
 
 
 class DatabaseSchemaEditor(BaseDatabaseSchemaEditor):
@@ -27,8 +36,132 @@ class DatabaseSchemaEditor(BaseDatabaseSchemaEditor):
 
     sql_drop_constraint = 'ALTER TABLE %(table)s DROP CONSTRAINT IF EXISTS %(name)s'
 
+    sql_create_fulltext_catalog = 'IF NOT EXISTS (SELECT 1 FROM sys.fulltext_catalogs WHERE name = %(catalog_name)s) ' \
+                                  'CREATE FULLTEXT CATALOG %(catalog)s'
+    # the key index is the primary key, whose name is generated by SQL Server
+    sql_create_fulltext_index = """
+DECLARE @key SYSNAME = (SELECT name FROM sys.indexes WHERE object_id = OBJECT_ID(%(table_name)s) AND is_primary_key = 1);
+EXEC(N'CREATE FULLTEXT INDEX ON %(table)s (%(columns)s) KEY INDEX ' + QUOTENAME(@key) + N' ON %(catalog)s')"""
+    sql_delete_fulltext_index = 'DROP FULLTEXT INDEX ON %(table)s'
+
+    sql_create_json_key_index = 'ALTER TABLE %(table)s ADD %(column)s AS %(expression)s PERSISTED;' \
+                                'CREATE INDEX %(name)s ON %(table)s (%(column)s)'
+    sql_delete_json_key_index = 'DROP INDEX IF EXISTS %(name)s ON %(table)s;' \
+                                'ALTER TABLE %(table)s DROP COLUMN IF EXISTS %(column)s'
+
+    # expression indexes are built on persisted computed columns, shared by the indexes of a table
+    sql_create_expression_column = 'IF COL_LENGTH(%(table_name)s, %(column_name)s) IS NULL ' \
+                                   'ALTER TABLE %(table)s ADD %(column)s AS %(expression)s PERSISTED'
+    sql_delete_expression_columns = """
+DECLARE @drop NVARCHAR(MAX) = N'';
+SELECT @drop += N'ALTER TABLE ' + QUOTENAME(OBJECT_NAME(c.object_id)) + N' DROP COLUMN ' + QUOTENAME(c.name) + N';'
+FROM sys.computed_columns c
+WHERE c.object_id = OBJECT_ID(%(table_name)s) AND LEFT(c.name, 6) = N'_expr_' AND NOT EXISTS (
+    SELECT 1 FROM sys.index_columns ic WHERE ic.object_id = c.object_id AND ic.column_id = c.column_id);
+EXEC(@drop)"""
+
+    sql_create_columnstore_index = 'CREATE %(kind)s COLUMNSTORE INDEX %(name)s ON %(table)s%(columns)s%(condition)s' \
+                                   '%(options)s%(partition)s'
+
+    sql_rebuild_table = 'ALTER TABLE %(table)s REBUILD PARTITION = ALL%(options)s'
+    data_compressions = {'NONE', 'ROW', 'PAGE', 'COLUMNSTORE', 'COLUMNSTORE_ARCHIVE'}
+
+    sql_create_partition_function = 'IF NOT EXISTS (SELECT 1 FROM sys.partition_functions ' \
+                                    'WHERE name = %(function_name)s) ' \
+                                    'CREATE PARTITION FUNCTION %(function)s (%(type)s) ' \
+                                    'AS RANGE %(range)s FOR VALUES (%(boundaries)s)'
+    sql_create_partition_scheme = 'IF NOT EXISTS (SELECT 1 FROM sys.partition_schemes WHERE name = %(scheme_name)s) ' \
+                                  'CREATE PARTITION SCHEME %(scheme)s AS PARTITION %(function)s ALL TO (%(filegroup)s)'
+    sql_create_partitioned_pk = 'ALTER TABLE %(table)s ADD CONSTRAINT %(name)s PRIMARY KEY %(kind)s (%(columns)s) ' \
+                                'ON %(scheme)s(%(column)s)'
+    sql_switch_partition = 'ALTER TABLE %(table)s SWITCH PARTITION %(partition)d TO %(target)s%(target_partition)s'
+    sql_split_partition = 'ALTER PARTITION SCHEME %(scheme)s NEXT USED %(filegroup)s;' \
+                          'ALTER PARTITION FUNCTION %(function)s() SPLIT RANGE (%(boundary)s)'
+    sql_merge_partition = 'ALTER PARTITION FUNCTION %(function)s() MERGE RANGE (%(boundary)s)'
+
+    sql_memory_optimized = ' WITH (MEMORY_OPTIMIZED = ON, DURABILITY = %(durability)s)'
+    # memory optimized tables only accept indexes through ALTER TABLE
+    sql_create_memory_index = 'ALTER TABLE %(table)s ADD INDEX %(name)s NONCLUSTERED%(hash)s (%(columns)s)%(options)s'
+    sql_delete_memory_index = 'ALTER TABLE %(table)s DROP INDEX %(name)s'
+    durabilities = {'SCHEMA_ONLY', 'SCHEMA_AND_DATA'}
+
+    # set by tds_django.ddl.IndexOptions for the following operations of a migration
+    index_options = {}
+
+    sql_switch_table = 'ALTER TABLE %(old_table)s SWITCH TO %(table)s'
+    sql_reseed = 'DBCC CHECKIDENT (%(table)s, RESEED)'
+    sql_copy_rows = 'INSERT INTO %(table)s%(hints)s (%(source)s) SELECT %(dest)s FROM %(old_table)s%(where)s'
+    sql_copy_rows_upper = 'SELECT MAX(%(pk)s), COUNT(*) ' \
+                          'FROM (SELECT TOP (%(size)d) %(pk)s FROM %(old_table)s%(where)s ORDER BY %(pk)s) t'
+    # rows copied per statement by _remake_table
+    remake_batch_size = 100000
+
     _auto_field_types = {'AutoField', 'BigAutoField', 'SmallAutoField'}
 
+    # DDL changing constraints, defaults or identities, statements running dynamic SQL or dropping a table may affect
+    # any table
+    _metadata_ddl = re.compile(r'\b(CONSTRAINT|INDEX|KEY|UNIQUE|DEFAULT|IDENTITY|CHECK|DROP|SWITCH|CREATE|REBUILD)\b',
+                               re.IGNORECASE)
+    _metadata_any_table = re.compile(r'\bEXEC\b|\bDROP\s+TABLE\b', re.IGNORECASE)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._metadata = {}
+
+    def __enter__(self):
+        editor = super().__enter__()
+        # sees the statements of the editor as well as those run through connection.cursor() (ie in RunPython)
+        self.connection.execute_wrappers.append(self._invalidating_execute)
+        return editor
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            return super().__exit__(exc_type, exc_value, traceback)
+        finally:
+            self.connection.execute_wrappers.remove(self._invalidating_execute)
+
+    def execute(self, sql, params=()):
+        super().execute(sql, params)
+        if self.collect_sql and self._metadata:
+            # collected statements are not run on the connection
+            self._invalidate_metadata(str(sql))
+
+    def _invalidating_execute(self, execute, sql, params, many, context):
+        result = execute(sql, params, many, context)
+        if self._metadata:
+            self._invalidate_metadata(str(sql))
+        return result
+
+    def _table_metadata(self, table_name, kind):
+        """
+        constraints, sequences or defaults of the table as returned by the introspection, cached until the editor
+        runs DDL that may change them
+        """
+        key = (table_name, kind)
+        if key not in self._metadata:
+            introspection = self.connection.introspection
+            method = {
+                'constraints': introspection.get_constraints,
+                'sequences': introspection.get_sequences,
+                'defaults': introspection.get_table_defaults,
+            }[kind]
+            with self.connection.cursor() as cursor:
+                self._metadata[key] = method(cursor, table_name)
+        return self._metadata[key]
+
+    def _invalidate_metadata(self, sql):
+        # quoted names and strings cannot be mistaken for keywords
+        keywords = re.sub(r"\[[^\]]*\]|'[^']*'", '', sql)
+        if self._metadata_any_table.search(keywords):
+            self._metadata.clear()
+        elif self._metadata_ddl.search(keywords):
+            keys = [key for key in self._metadata if self.quote_name(key[0]) in sql]
+            if not keys:
+                # the table is not quoted (RunSQL, cursors), it may be any of them
+                self._metadata.clear()
+            for key in keys:
+                del self._metadata[key]
+
     def prepare_default(self, value):
         return self.quote_value(value)
 
@@ -54,31 +187,28 @@ class DatabaseSchemaEditor(BaseDatabaseSchemaEditor):
 
     def _alter_column_default_sql(self, model, old_field, new_field, drop=False):
         if drop:
-            with self.connection.cursor() as cursor:
-                defaults = self.connection.introspection.get_table_defaults(cursor, model._meta.db_table)
-                constraint_name = defaults.get(new_field.column, ['DEF_DOES_NOT_EXIST'])[0]
+            defaults = self._table_metadata(model._meta.db_table, 'defaults')
+            constraint_name = defaults.get(new_field.column, ['DEF_DOES_NOT_EXIST'])[0]
             return (self.sql_alter_column_no_default % {
                 'column': constraint_name,
             }, [])
         return super()._alter_column_default_sql(model, old_field, new_field)
 
     def _is_identity_column(self, table_name, column_name):
-        with self.connection.cursor() as cursor:
-            sequences = self.connection.introspection.get_sequences(cursor, table_name)
+        sequences = self._table_metadata(table_name, 'sequences')
         return column_name in [s['column'] for s in sequences]
 
     def _drop_pk(self, table_name, column_name):
-        with self.connection.cursor() as cursor:
-            constraints = self.connection.introspection.get_constraints(cursor, table_name)
-            # drop primary key
-            for name, props in constraints.items():
-                if props['primary_key'] and column_name in props['columns']:
-                    self.execute(self.sql_drop_constraint % {
-                        'table': self.quote_name(table_name),
-                        'name': self.quote_name(name)
-                    })
-                    # django 3.2 only supports one pk
-                    break
+        constraints = self._table_metadata(table_name, 'constraints')
+        # drop primary key
+        for name, props in constraints.items():
+            if props['primary_key'] and column_name in props['columns']:
+                self.execute(self.sql_drop_constraint % {
+                    'table': self.quote_name(table_name),
+                    'name': self.quote_name(name)
+                })
+                # django 3.2 only supports one pk
+                break
 
     def _set_field_new_type_null_status(self, field, new_type):
         """ same mysql """
@@ -92,10 +222,17 @@ class DatabaseSchemaEditor(BaseDatabaseSchemaEditor):
                      old_db_params, new_db_params, strict=False):
         old_internal = old_field.get_internal_type()
         new_internal = new_field.get_internal_type()
-        if (old_internal in self._auto_field_types) != (new_internal in self._auto_field_types):
+        # renaming a column of a memory optimized table needs SQL Server 2017
+        memory_rename = (old_field.column != new_field.column and self._memory_optimized(model)
+                         and self.connection.sql_server_level < 140)
+        if (old_internal in self._auto_field_types) != (new_internal in self._auto_field_types) or memory_rename:
             # need to recreate either column or table
             # choose remaking table like sqlite yolo
             # delete FKs and their index
+            if self._identity_switchable(model, old_field, new_field, old_type, new_type):
+                # only the identity changes, the rows are switched to the new table
+                self._remake_table(model, alter_field=(old_field, new_field), switch=True)
+                return
             for _old_rel, new_rel in _related_non_m2m_objects(old_field, new_field):
                 self._remove_constraints(new_rel.related_model, new_rel.field.column)
 
@@ -126,10 +263,14 @@ class DatabaseSchemaEditor(BaseDatabaseSchemaEditor):
         else:
             # null does not allow "post actions"
             post_actions = []
+            # computed columns block the alter
+            for index in self._expression_indexes_referencing(model, old_field):
+                self.execute(index.remove_sql(model, self))
+                post_actions.append(index.create_sql(model, self))
             if old_field.null and not new_field.null:
                 # drop and recreate indices
-                post_actions = self._remove_constraints(model, old_field.column, new_field, index=True, pk=False,
-                                                        fk=False, check=False, unique=False)
+                post_actions += self._remove_constraints(model, old_field.column, new_field, index=True, pk=False,
+                                                         fk=False, check=False, unique=False)
             super()._alter_field(model, old_field, new_field, old_type, new_type, old_db_params, new_db_params, strict)
             if self._field_becomes_null_unique(old_field, new_field):
                 column = new_field.column
@@ -168,9 +309,16 @@ class DatabaseSchemaEditor(BaseDatabaseSchemaEditor):
             if isinstance(sql, Statement) and sql.references_column(model._meta.db_table, field.column):
                 self.deferred_sql.remove(sql)
 
-    def _remake_table(self, model, create_field=None, delete_field=None, alter_field=None):
+    def _identity_switchable(self, model, old_field, new_field, old_type, new_type):
+        """ ALTER TABLE SWITCH ignores the identity property but needs otherwise identical columns """
+        return (old_field.column == new_field.column and old_type == new_type and old_field.null == new_field.null
+                and old_field.primary_key == new_field.primary_key and not self._memory_optimized(model)
+                and not self._table_options(model).partitioning)
+
+    def _remake_table(self, model, create_field=None, delete_field=None, alter_field=None, switch=False):
         """
-        Similar to sqlite
+        Similar to sqlite. With switch the rows are moved to the new table as metadata only, the tables then only
+        differ by the identity property (see _identity_switchable).
         """
         # Self-referential fields must be recreated rather than copied from
         # the old model to ensure their remote_field.field_name doesn't refer
@@ -282,6 +430,15 @@ class DatabaseSchemaEditor(BaseDatabaseSchemaEditor):
 
         # Construct a model with a renamed table name.
         body_copy = copy.deepcopy(body)
+        options = self._table_options(model)
+        if options.partitioning:
+            # the new table stays on the partition function and scheme named after the original one
+            partitioning = options.partitioning
+            _, args, kwargs = partitioning.deconstruct()
+            options = copy.copy(options)
+            options.partitioning = type(partitioning)(*args, **{**kwargs, 'function': partitioning.function_name(model),
+                                                                'scheme': partitioning.scheme_name(model)})
+            constraints = [options if isinstance(c, TableOptions) else c for c in constraints]
         meta_contents = {
             'app_label': model._meta.app_label,
             'db_table': 'new__%s' % strip_quotes(model._meta.db_table),
@@ -299,25 +456,41 @@ class DatabaseSchemaEditor(BaseDatabaseSchemaEditor):
         # Create a new table with the updated schema.
         self.create_model(new_model)
 
-        # Copy data from the old table into the new table
-        sql = 'INSERT INTO %(table)s (%(source)s) SELECT %(dest)s FROM %(old_table)s' % {
-            'table': self.quote_name(new_model._meta.db_table),
-            'source': ', '.join(self.quote_name(x) for x in mapping),
-            'dest': ', '.join(mapping.values()),
-            'old_table': self.quote_name(model._meta.db_table),
-        }
-        if new_model._meta.auto_field:
-            sql = 'SET IDENTITY_INSERT %(table)s ON;%(sql)s; SET IDENTITY_INSERT %(table)s OFF' % {
-                'sql': sql,
+        if switch:
+            # the old table cannot be referenced, self references are recreated with the new table
+            with self.connection.cursor() as cursor:
+                cursor.execute(Introspection.referencing_fks, (model._meta.db_table, ))
+                fks = cursor.fetchall()
+            for name, table, _, _ in fks:
+                self.execute(self.sql_drop_constraint % {
+                    'table': self.quote_name(table),
+                    'name': self.quote_name(name),
+                })
+            fks = [fk for fk in fks if fk[1] != model._meta.db_table]
+            self.execute(self.sql_switch_table % {
+                'old_table': self.quote_name(model._meta.db_table),
                 'table': self.quote_name(new_model._meta.db_table),
-            }
-        self.execute(sql)
+            })
+            if new_model._meta.auto_field:
+                self.execute(self.sql_reseed % {'table': self.quote_name(new_model._meta.db_table)})
+        else:
+            fks = []
+            self._copy_rows(model, new_model, mapping)
 
         # Delete the old table to make way for the new
         self.delete_model(model, handle_autom2m=False)
 
         # Rename the new table to take way for the old
         self.alter_db_table(new_model, new_model._meta.db_table, model._meta.db_table)  # , disable_constraints=False,
+        for name, table, column, to_column in fks:
+            self.execute(self.sql_create_fk % {
+                'table': self.quote_name(table),
+                'name': self.quote_name(name),
+                'column': self.quote_name(column),
+                'to_table': self.quote_name(model._meta.db_table),
+                'to_column': self.quote_name(to_column),
+                'deferrable': '',
+            })
 
         # Run deferred SQL on correct table
         for sql in self.deferred_sql:
@@ -327,6 +500,176 @@ class DatabaseSchemaEditor(BaseDatabaseSchemaEditor):
         if restore_pk_field:
             restore_pk_field.primary_key = True
 
+    def create_model(self, model):
+        partitioning = self._table_options(model).partitioning
+        if partitioning:
+            self._create_partition_scheme(model, partitioning)
+        durability = self._memory_optimized(model)
+        if durability:
+            self.sql_create_table = type(self).sql_create_table + self.sql_memory_optimized % {
+                'durability': durability,
+            }
+        try:
+            super().create_model(model)
+        finally:
+            self.__dict__.pop('sql_create_table', None)
+        if partitioning:
+            self._partition_table(model, partitioning)
+        data_compression = self._table_options(model).data_compression
+        if data_compression:
+            # the table is empty
+            self._rebuild_table(model, data_compression)
+
+    def add_constraint(self, model, constraint):
+        if isinstance(constraint, TableOptions):
+            self._alter_table_options(model, constraint)
+        else:
+            super().add_constraint(model, constraint)
+
+    def remove_constraint(self, model, constraint):
+        if isinstance(constraint, TableOptions):
+            self._alter_table_options(model, constraint)
+        else:
+            super().remove_constraint(model, constraint)
+
+    def _alter_table_options(self, model, options):
+        """
+        options are added to or removed from model, which is the model after the change. A table is memory optimized
+        or partitioned when created: it is then rebuilt, a compression change is a rebuild in place.
+        """
+        if options.memory_optimized or options.partitioning:
+            self._remake_table(model)
+        elif options.data_compression:
+            self._rebuild_table(model, self._table_options(model).data_compression or 'NONE')
+
+    def _rebuild_table(self, model, data_compression):
+        self.execute(self.sql_rebuild_table % {
+            'table': self.quote_name(model._meta.db_table),
+            'options': self._data_compression_sql(data_compression),
+        })
+
+    def _table_options(self, model):
+        """ the TableOptions of the model, empty ones when it declares none """
+        return next((c for c in model._meta.constraints if isinstance(c, TableOptions)), TableOptions(name=''))
+
+    def _memory_optimized(self, model):
+        """ durability of a memory optimized table, TableOptions.memory_optimized is True or the durability """
+        durability = self._table_options(model).memory_optimized
+        if not durability:
+            return None
+        durability = 'SCHEMA_AND_DATA' if durability is True else durability.upper()
+        if durability not in self.durabilities:
+            raise ValueError('Unknown durability %r.' % durability)
+        return durability
+
+    def _create_partition_scheme(self, model, partitioning):
+        field = model._meta.get_field(partitioning.field)
+        function = partitioning.function_name(model)
+        scheme = partitioning.scheme_name(model)
+        self.execute(self.sql_create_partition_function % {
+            'function_name': self.quote_value(function),
+            'function': self.quote_name(function),
+            'type': field.db_parameters(connection=self.connection)['type'],
+            'range': partitioning.range,
+            'boundaries': ', '.join(self.quote_value(value) for value in partitioning.boundaries),
+        })
+        self.execute(self.sql_create_partition_scheme % {
+            'scheme_name': self.quote_value(scheme),
+            'scheme': self.quote_name(scheme),
+            'function': self.quote_name(function),
+            'filegroup': self.quote_name(partitioning.filegroup),
+        })
+
+    def _partition_table(self, model, partitioning):
+        """
+        moves the new table on the scheme through its primary key, which has to include the partition column.
+        Indexes created afterwards are aligned by default.
+        """
+        table = model._meta.db_table
+        pk = model._meta.pk
+        column = model._meta.get_field(partitioning.field).column
+        columns = [pk.column] if pk.column == column else [pk.column, column]
+        self._drop_pk(table, pk.column)
+        clustered = not any(getattr(index, 'clustered', False) for index in model._meta.indexes)
+        self.execute(self.sql_create_partitioned_pk % {
+            'table': self.quote_name(table),
+            'name': self.quote_name(self._create_index_name(table, columns, suffix='_pk')),
+            'kind': 'CLUSTERED' if clustered else 'NONCLUSTERED',
+            'columns': ', '.join(self.quote_name(c) for c in columns),
+            'scheme': self.quote_name(partitioning.scheme_name(model)),
+            'column': self.quote_name(column),
+        })
+
+    def switch_partition(self, model, partition, target, target_partition=None):
+        """
+        metadata only move of a partition to target, a model or table name with the same structure (ie for retention:
+        switch out to a staging table and truncate it)
+        """
+        target = target if isinstance(target, str) else target._meta.db_table
+        self.execute(self.sql_switch_partition % {
+            'table': self.quote_name(model._meta.db_table),
+            'partition': partition,
+            'target': self.quote_name(target),
+            'target_partition': ' PARTITION %d' % target_partition if target_partition is not None else '',
+        })
+
+    def split_partition(self, model, boundary):
+        """ adds a partition, only metadata when the split partition is empty """
+        partitioning = self._table_options(model).partitioning
+        self.execute(self.sql_split_partition % {
+            'scheme': self.quote_name(partitioning.scheme_name(model)),
+            'filegroup': self.quote_name(partitioning.filegroup),
+            'function': self.quote_name(partitioning.function_name(model)),
+            'boundary': self.quote_value(boundary),
+        })
+
+    def merge_partition(self, model, boundary):
+        """ removes the boundary, ie after switching out the oldest partition """
+        self.execute(self.sql_merge_partition % {
+            'function': self.quote_name(self._table_options(model).partitioning.function_name(model)),
+            'boundary': self.quote_value(boundary),
+        })
+
+    def _copy_rows(self, model, new_model, mapping):
+        """
+        Copy data from the old table into the new table by ranges of remake_batch_size keys, with TABLOCK so that the
+        inserts are minimally logged under the SIMPLE or BULK_LOGGED recovery model. Progress is logged, each range
+        is committed when the migration is not atomic. Memory optimized tables reject TABLOCK and are copied at once.
+        """
+        memory_optimized = self._memory_optimized(new_model)
+        table = self.quote_name(new_model._meta.db_table)
+        old_table = self.quote_name(model._meta.db_table)
+        sql = {
+            'table': table,
+            'source': ', '.join(self.quote_name(x) for x in mapping),
+            'dest': ', '.join(mapping.values()),
+            'old_table': old_table,
+            'hints': '' if memory_optimized else ' WITH (TABLOCK)',
+        }
+        if new_model._meta.auto_field:
+            self.execute('SET IDENTITY_INSERT %s ON' % table)
+        pk = self.quote_name(model._meta.pk.column)
+        if self.collect_sql or memory_optimized or mapping.get(new_model._meta.pk.column) != pk:
+            self.execute(self.sql_copy_rows % dict(sql, where=''))
+        else:
+            last, copied = None, 0
+            while True:
+                where = ' WHERE %s > %%s' % pk if copied else ''
+                params = [last] if copied else []
+                with self.connection.cursor() as cursor:
+                    cursor.execute(self.sql_copy_rows_upper % {
+                        'pk': pk, 'size': self.remake_batch_size, 'old_table': old_table, 'where': where,
+                    }, params)
+                    upper, count = cursor.fetchone()
+                if not count:
+                    break
+                where += ' AND ' if copied else ' WHERE '
+                self.execute(self.sql_copy_rows % dict(sql, where=where + '%s <= %%s' % pk), params + [upper])
+                last, copied = upper, copied + count
+                logger.info('%s: %d rows copied', model._meta.db_table, copied)
+        if new_model._meta.auto_field:
+            self.execute('SET IDENTITY_INSERT %s OFF' % table)
+
     def delete_model(self, model, handle_autom2m=True):
         if handle_autom2m:
             super().delete_model(model)
@@ -346,8 +689,7 @@ class DatabaseSchemaEditor(BaseDatabaseSchemaEditor):
         table_name = model._meta.db_table
         reverse = []
         new_db_params = new_field.db_parameters(connection=self.connection) if new_field else None
-        with self.connection.cursor() as cursor:
-            constraints = self.connection.introspection.get_constraints(cursor, table_name)
+        constraints = self._table_metadata(table_name, 'constraints')
         for name, info in constraints.items():
             if column_name in info['columns']:
                 sql = None
@@ -385,12 +727,13 @@ class DatabaseSchemaEditor(BaseDatabaseSchemaEditor):
                             condition = ''
                         else:
                             condition = f" WHERE {info['filter_definition']}" if info['has_filter'] else ''
-                        reverse.append('CREATE %s INDEX %s ON %s (%s)%s' % (
+                        reverse.append('CREATE %s INDEX %s ON %s (%s)%s%s' % (
                             'UNIQUE' if info['unique'] else '',
                             self.quote_name(name),
                             self.quote_name(table_name),
                             ', '.join(self.quote_name(c) for c in columns),
                             condition,
+                            self._index_with_sql(),
                         ))
                 if sql:
                     self.execute(sql % {
@@ -405,11 +748,18 @@ class DatabaseSchemaEditor(BaseDatabaseSchemaEditor):
         if not new_field.null:
             (sql, params) = fragment
             fragment = (sql + ' NOT NULL', params)
+        fragment = (fragment[0] + self._alter_column_online_sql(), fragment[1])
         # at this point the field would have already be renamed
         todo = self._remove_constraints(model, new_field.column, new_field)
         more += [(sql, []) for sql in todo]
         return fragment, more
 
+    def _alter_column_null_sql(self, model, old_field, new_field):
+        fragment = super()._alter_column_null_sql(model, old_field, new_field)
+        if fragment:
+            fragment = (fragment[0] + self._alter_column_online_sql(), fragment[1])
+        return fragment
+
     def _collate_sql(self, collation, old_collation=None, table_name=None):
         return ' COLLATE ' + collation if collation else ''
 
@@ -429,15 +779,186 @@ class DatabaseSchemaEditor(BaseDatabaseSchemaEditor):
             sql, params = super().column_sql(model, field, include_default)
             field._unique = True
             return sql, params
-        return super().column_sql(model, field, include_default)
+        sql, params = super().column_sql(model, field, include_default)
+        if sql and field.primary_key and (self._memory_optimized(model) or any(
+                getattr(index, 'clustered', False) for index in model._meta.indexes)):
+            # the clustered columnstore index takes the place of the clustered primary key, memory optimized tables
+            # have none
+            sql = sql.replace(' PRIMARY KEY', ' PRIMARY KEY NONCLUSTERED', 1)
+        return sql, params
 
     def _create_index_sql(self, model, *, fields=None, sql=None, suffix='', **kwargs):
         """ for nullable unique constraint """
-        if not sql and len(fields) == 1 and fields[0].unique and fields[0].null:
+        columnstore = kwargs.pop('columnstore', None)
+        if columnstore:
+            return self._create_columnstore_index_sql(model, fields, columnstore, **kwargs)
+        bucket_count = kwargs.pop('bucket_count', None)
+        if self._memory_optimized(model) and not kwargs.get('expressions'):
+            return self._create_memory_index_sql(model, fields, suffix=suffix, bucket_count=bucket_count, **kwargs)
+        if bucket_count:
+            raise NotSupportedError('Hash indexes need a memory optimized table.')
+        options = self._index_with_sql(kwargs.pop('data_compression', None))
+        if kwargs.get('expressions'):
+            statement = self._create_expression_index_sql(model, sql or self.sql_create_index, **kwargs)
+        elif not sql and len(fields) == 1 and fields[0].unique and fields[0].null:
             column = fields[0].column
             condition = '%s IS NOT NULL' % self.quote_name(column)
-            return self._create_unique_sql(model, fields, condition=condition)
-        return super()._create_index_sql(model, fields=fields, sql=sql, suffix=suffix, **kwargs)
+            statement = self._create_unique_sql(model, fields, condition=condition)
+        else:
+            statement = super()._create_index_sql(model, fields=fields, sql=sql, suffix=suffix, **kwargs)
+        if options:
+            return Statement('%(index)s%(options)s', index=statement, options=options)
+        return statement
+
+    def _create_columnstore_index_sql(self, model, fields, kind, *, name, condition=None, data_compression=None,
+                                      **kwargs):
+        """ see ColumnstoreIndex, a clustered one covers the whole table """
+        table = model._meta.db_table
+        columns = ''
+        if fields:
+            columns = Statement(' (%(columns)s)', columns=Columns(table, [field.column for field in fields],
+                                                                 self.quote_name))
+        partition = ''
+        partitioning = self._table_options(model).partitioning
+        if partitioning:
+            # the table is only partitioned through its nonclustered primary key
+            partition = ' ON %s(%s)' % (self.quote_name(partitioning.scheme_name(model)),
+                                        self.quote_name(model._meta.get_field(partitioning.field).column))
+        return Statement(
+            self.sql_create_columnstore_index,
+            kind=kind,
+            table=Table(table, self.quote_name),
+            name=self.quote_name(name),
+            columns=columns,
+            condition=self._index_condition_sql(condition),
+            options=self._index_with_sql(data_compression),
+            partition=partition,
+        )
+
+    def _create_memory_index_sql(self, model, fields, *, name=None, suffix='', bucket_count=None, col_suffixes=(),
+                                 **kwargs):
+        """ range index, or hash index when bucket_count is given (see HashIndex) """
+        table = model._meta.db_table
+        columns = [field.column for field in fields]
+        return Statement(
+            self.sql_create_memory_index,
+            table=Table(table, self.quote_name),
+            name=self.quote_name(name or self._create_index_name(table, columns, suffix=suffix)),
+            hash=' HASH' if bucket_count else '',
+            columns=Columns(table, columns, self.quote_name, col_suffixes=col_suffixes),
+            options=' WITH (BUCKET_COUNT = %d)' % bucket_count if bucket_count else '',
+        )
+
+    def _index_with_sql(self, data_compression=None):
+        """ WITH clause of index creation: data compression and index_options """
+        options = self._data_compression_options(data_compression) if data_compression else []
+        index_options = self.index_options
+        if index_options.get('online'):
+            online = 'ONLINE = ON'
+            if index_options.get('wait_at_low_priority'):
+                minutes, abort_after_wait = index_options['wait_at_low_priority']
+                online += ' (WAIT_AT_LOW_PRIORITY (MAX_DURATION = %d MINUTES, ABORT_AFTER_WAIT = %s))' % (
+                    minutes, abort_after_wait.upper())
+            options.append(online)
+        if index_options.get('resumable'):
+            options.append('RESUMABLE = ON')
+            if index_options.get('max_duration'):
+                options.append('MAX_DURATION = %d MINUTES' % index_options['max_duration'])
+        if index_options.get('maxdop') is not None:
+            options.append('MAXDOP = %d' % index_options['maxdop'])
+        return ' WITH (%s)' % ', '.join(options) if options else ''
+
+    def _alter_column_online_sql(self):
+        return ' WITH (ONLINE = ON)' if self.index_options.get('online') else ''
+
+    def _data_compression_sql(self, data_compression):
+        return ' WITH (%s)' % ', '.join(self._data_compression_options(data_compression))
+
+    def _data_compression_options(self, data_compression):
+        """ data_compression is either a compression or a {partition number (or 'n TO m'): compression} dict """
+        if isinstance(data_compression, str):
+            data_compression = {None: data_compression}
+        options = []
+        for partitions, compression in data_compression.items():
+            if compression.upper() not in self.data_compressions:
+                raise ValueError('Unknown data compression %r.' % compression)
+            option = 'DATA_COMPRESSION = %s' % compression.upper()
+            if partitions is not None:
+                option += ' ON PARTITIONS (%s)' % partitions
+            options.append(option)
+        return options
+
+    def _create_unique_sql(self, model, *args, expressions=None, **kwargs):
+        if expressions:
+            name = args[1] if len(args) > 1 else kwargs['name']
+            return self._create_expression_index_sql(
+                model, self.sql_create_unique_index, name=name, expressions=expressions,
+                condition=kwargs.get('condition'), include=kwargs.get('include'))
+        return super()._create_unique_sql(model, *args, expressions=expressions, **kwargs)
+
+    def _create_expression_index_sql(self, model, sql, *, name, expressions, condition=None, include=None,
+                                     **kwargs):
+        """
+        SQL Server can only index columns: each expression becomes a persisted computed column named after
+        its definition, the optimizer then matches the same expression in queries to the column.
+        """
+        table = model._meta.db_table
+        compiler = Query(model, alias_cols=False).get_compiler(connection=self.connection)
+        add_columns, columns, col_suffixes = [], [], []
+        for index_expression in expressions.get_source_expressions():
+            expression = index_expression.get_source_expressions()[0]
+            descending = isinstance(expression, OrderBy) and expression.descending
+            if isinstance(expression, OrderBy):
+                expression = expression.expression
+            expression_sql, params = compiler.compile(expression)
+            expression_sql = '(%s)' % (expression_sql % tuple(self.quote_value(p) for p in params))
+            column = '_expr_%s' % names_digest(expression_sql, length=16)
+            add_columns.append(self.sql_create_expression_column % {
+                'table_name': self.quote_value(table),
+                'column_name': self.quote_value(column),
+                'table': self.quote_name(table),
+                'column': self.quote_name(column),
+                'expression': expression_sql,
+            })
+            columns.append(column)
+            col_suffixes.append(' DESC' if descending else '')
+        index = Statement(
+            sql,
+            table=Table(table, self.quote_name),
+            name=self.quote_name(name),
+            using='',
+            columns=Columns(table, columns, self.quote_name, col_suffixes=col_suffixes),
+            extra='',
+            condition=self._index_condition_sql(condition),
+            include=self._index_include_sql(model, include),
+            deferrable='',
+        )
+        return Statement('%(columns)s;%(index)s', columns=';'.join(add_columns), index=index)
+
+    def _delete_index_sql(self, model, name, sql=None):
+        # django 4 no longer builds it with _delete_constraint_sql
+        return self._delete_constraint_sql(sql or self.sql_delete_index, model, name)
+
+    def _delete_constraint_sql(self, template, model, name):
+        if template == self.sql_delete_index and self._memory_optimized(model):
+            template = self.sql_delete_memory_index
+        statement = super()._delete_constraint_sql(template, model, name)
+        if template in (self.sql_delete_index, self.sql_delete_memory_index):
+            # drop the computed columns no longer used by an expression index
+            return Statement('%(index)s;%(columns)s', index=statement, columns=self.sql_delete_expression_columns % {
+                'table_name': self.quote_value(model._meta.db_table),
+            })
+        return statement
+
+    def _expression_indexes_referencing(self, model, field):
+        """ indexes and unique constraints whose expressions use field """
+        result = []
+        for index in [*model._meta.indexes, *model._meta.constraints]:
+            if any(isinstance(e, F) and e.name == field.name
+                   for expression in getattr(index, 'expressions', ())
+                   for e in (expression.flatten() if hasattr(expression, 'flatten') else [expression])):
+                result.append(index)
+        return result
 
     def _unique_should_be_added(self, old_field, new_field):
         if self._field_becomes_null_unique(old_field, new_field):
@@ -446,3 +967,44 @@ class DatabaseSchemaEditor(BaseDatabaseSchemaEditor):
 
     def _field_becomes_null_unique(self, old_field, new_field):
         return not (old_field.null and old_field.unique) and new_field.null and new_field.unique
+
+    def _create_fulltext_index_sql(self, model, fields, catalog, language=None):
+        """ see FullTextIndex, needs a non atomic migration. language is an LCID or a name """
+        if language is None:
+            language = ''
+        elif isinstance(language, str):
+            # the columns are part of the EXEC string
+            language = ' LANGUAGE %s' % self.quote_value(language).replace("'", "''")
+        else:
+            language = ' LANGUAGE %d' % language
+        return ';'.join([
+            self.sql_create_fulltext_catalog % {
+                'catalog_name': self.quote_value(catalog),
+                'catalog': self.quote_name(catalog),
+            },
+            self.sql_create_fulltext_index % {
+                'table_name': self.quote_value(model._meta.db_table),
+                'table': self.quote_name(model._meta.db_table),
+                'columns': ', '.join(self.quote_name(field.column) + language for field in fields),
+                'catalog': self.quote_name(catalog),
+            },
+        ])
+
+    def _delete_fulltext_index_sql(self, model):
+        return self.sql_delete_fulltext_index % {'table': self.quote_name(model._meta.db_table)}
+
+    def _create_json_key_index_sql(self, model, field, keys, column, name):
+        """ see JSONKeyIndex """
+        return self.sql_create_json_key_index % {
+            'table': self.quote_name(model._meta.db_table),
+            'column': self.quote_name(column),
+            'expression': self.connection.ops.json_value_sql(self.quote_name(field.column), keys),
+            'name': self.quote_name(name),
+        }
+
+    def _delete_json_key_index_sql(self, model, column, name):
+        return self.sql_delete_json_key_index % {
+            'table': self.quote_name(model._meta.db_table),
+            'column': self.quote_name(column),
+            'name': self.quote_name(name),
+        }
@@ -0,0 +1,56 @@
+from django.db.models import CharField, F, IntegerField, Lookup, TextField
+from django.db.models.expressions import Col, Expression
+
+
+class FullTextContains(Lookup):
+    """ field__contains_fts='"word*" AND other', needs a FullTextIndex on the field """
+    lookup_name = 'contains_fts'
+    function = 'CONTAINS'
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return '%s(%s, %s)' % (self.function, lhs, rhs), (*lhs_params, *rhs_params)
+
+
+class FreeText(FullTextContains):
+    """ field__freetext='some words', needs a FullTextIndex on the field """
+    lookup_name = 'freetext'
+    function = 'FREETEXT'
+
+
+class FullTextRank(Expression):
+    """ RANK of the row from CONTAINSTABLE (or FREETEXTTABLE), 0 if it does not match """
+    output_field = IntegerField()
+
+    def __init__(self, expression, query, freetext=False):
+        super().__init__()
+        self.expression = F(expression) if isinstance(expression, str) else expression
+        self.query = query
+        self.freetext = freetext
+
+    def get_source_expressions(self):
+        return [self.expression]
+
+    def set_source_expressions(self, exprs):
+        self.expression, = exprs
+
+    def as_sql(self, compiler, connection):
+        if not isinstance(self.expression, Col):
+            raise ValueError('FullTextRank only supports a column of the model.')
+        qn = connection.ops.quote_name
+        opts = self.expression.target.model._meta
+        sql = 'ISNULL((SELECT ft.[RANK] FROM %s(%s, %s, %%s) AS ft WHERE ft.[KEY] = %s.%s), 0)' % (
+            'FREETEXTTABLE' if self.freetext else 'CONTAINSTABLE',
+            qn(opts.db_table),
+            qn(self.expression.target.column),
+            compiler.quote_name_unless_alias(self.expression.alias),
+            qn(opts.pk.column),
+        )
+        return sql, (self.query, )
+
+
+CharField.register_lookup(FullTextContains)
+CharField.register_lookup(FreeText)
+TextField.register_lookup(FullTextContains)
+TextField.register_lookup(FreeText)
@@ -122,6 +122,13 @@ ORDER BY
     i.index_id ASC,
     ic.index_column_id ASC """
 
+    get_data_compression = """
+SELECT i.name, i.index_id, p.partition_number, p.data_compression_desc
+FROM sys.partitions p
+JOIN sys.indexes i ON i.object_id = p.object_id AND i.index_id = p.index_id
+WHERE p.object_id = OBJECT_ID(%s)
+ORDER BY i.index_id, p.partition_number"""
+
     get_default = """
 SELECT c.name, d.name, d.definition
 FROM sys.tables t
@@ -139,14 +146,99 @@ FROM sys.foreign_keys AS f
     INNER JOIN sys.foreign_key_columns AS fc ON f.object_id = fc.constraint_object_id
 WHERE f.schema_id = SCHEMA_ID()"""
 
+    referencing_fks = """
+SELECT f.name, OBJECT_NAME(f.parent_object_id), COL_NAME(fc.parent_object_id, fc.parent_column_id),
+    COL_NAME(fc.referenced_object_id, fc.referenced_column_id)
+FROM sys.foreign_keys AS f
+    INNER JOIN sys.foreign_key_columns AS fc ON f.object_id = fc.constraint_object_id
+WHERE f.referenced_object_id = OBJECT_ID(%s)"""
+
     get_identities = """
 SELECT o.name, i.seed_value FROM sys.objects o
 INNER JOIN sys.columns c ON o.object_id = c.object_id
 LEFT JOIN sys.identity_columns i ON c.object_id = i.object_id
-WHERE o.schema_id = SCHEMA_ID() AND c.is_identity = 1 AND o.name IN (%s)"""
+WHERE o.schema_id = SCHEMA_ID() AND c.is_identity = 1"""
+
+    get_memory_optimized = """
+SELECT name FROM sys.tables WHERE schema_id = SCHEMA_ID() AND is_memory_optimized = 1"""
+
+    # changes whenever a table or a constraint is created, altered or dropped
+    schema_version = """
+SELECT COUNT_BIG(*), MAX(modify_date) FROM sys.objects WHERE schema_id = SCHEMA_ID()"""
+
+
+class Creation:
+    database_files = """
+SELECT name, physical_name, type FROM sys.master_files WHERE database_id = DB_ID(%s)"""
+
+    backup = "BACKUP DATABASE %(database)s TO DISK = %%s WITH COPY_ONLY, INIT, FORMAT"
+
+    restore = "RESTORE DATABASE %(database)s FROM DISK = %%s WITH %(moves)s, REPLACE"
+
+    delete_backup = "EXEC master.sys.xp_delete_file 0, %s"
+
+    drop_database = """
+ALTER DATABASE %(database)s SET SINGLE_USER WITH ROLLBACK IMMEDIATE;
+DROP DATABASE %(database)s"""
+
+    create_snapshot = "CREATE DATABASE %(snapshot)s ON %(files)s AS SNAPSHOT OF %(database)s"
+
+    snapshot_exists = """
+SELECT COUNT(*) FROM sys.databases WHERE name = %s AND source_database_id = DB_ID(%s)"""
+
+    restore_snapshot = """
+ALTER DATABASE %(database)s SET SINGLE_USER WITH ROLLBACK IMMEDIATE;
+RESTORE DATABASE %(database)s FROM DATABASE_SNAPSHOT = %(snapshot)s;
+ALTER DATABASE %(database)s SET MULTI_USER"""
+
+
+class Cache:
+    count = """
+SELECT SUM(rows) FROM sys.partitions WHERE object_id = OBJECT_ID(%s) AND index_id IN (0, 1)"""
+
+    get_many = """
+SELECT c.[cache_key], c.[value] FROM %(table)s c
+INNER JOIN OPENJSON(%%s) WITH (cache_key NVARCHAR(255) '$') j ON c.[cache_key] = j.cache_key
+WHERE c.[expires] >= %%s"""
+
+    set = """SET NOCOUNT OFF;
+MERGE %(table)s WITH (HOLDLOCK) AS t
+USING (SELECT %%s AS cache_key, %%s AS value, %%s AS expires) AS s ON t.[cache_key] = s.cache_key
+WHEN MATCHED THEN UPDATE SET [value] = s.value, [expires] = s.expires
+WHEN NOT MATCHED THEN INSERT ([cache_key], [value], [expires]) VALUES (s.cache_key, s.value, s.expires);"""
+
+    add = """SET NOCOUNT OFF;
+MERGE %(table)s WITH (HOLDLOCK) AS t
+USING (SELECT %%s AS cache_key, %%s AS value, %%s AS expires) AS s ON t.[cache_key] = s.cache_key
+WHEN MATCHED AND t.[expires] < %%s THEN UPDATE SET [value] = s.value, [expires] = s.expires
+WHEN NOT MATCHED THEN INSERT ([cache_key], [value], [expires]) VALUES (s.cache_key, s.value, s.expires);"""
+
+    set_many = """SET NOCOUNT OFF;
+MERGE %(table)s WITH (HOLDLOCK) AS t
+USING OPENJSON(%%s) WITH (cache_key NVARCHAR(255) '$[0]', value NVARCHAR(MAX) '$[1]') AS s
+    ON t.[cache_key] = s.cache_key
+WHEN MATCHED THEN UPDATE SET [value] = s.value, [expires] = %%s
+WHEN NOT MATCHED THEN INSERT ([cache_key], [value], [expires]) VALUES (s.cache_key, s.value, %%s);"""
+
+    touch = """SET NOCOUNT OFF;
+UPDATE %(table)s SET [expires] = %%s WHERE [cache_key] = %%s AND [expires] >= %%s"""
+
+    delete_many = """SET NOCOUNT OFF;
+DELETE c FROM %(table)s c
+INNER JOIN OPENJSON(%%s) WITH (cache_key NVARCHAR(255) '$') j ON c.[cache_key] = j.cache_key"""
+
+    cull_expired = """SET NOCOUNT OFF;
+DELETE TOP (%%s) FROM %(table)s WHERE [expires] < %%s"""
+
+    cull = """
+WITH c AS (SELECT TOP (%%s) [cache_key] FROM %(table)s ORDER BY [expires]) DELETE FROM c"""
 
 
 class Misc:
+    server_info = """
+SELECT CAST(SERVERPROPERTY('ProductMajorVersion') AS INT),
+    (SELECT compatibility_level FROM sys.databases WHERE name = DB_NAME())"""
+
     delete_table = """
 DECLARE @query NVARCHAR(MAX) = N'';
 SELECT @query += N' ALTER TABLE ' + QUOTENAME(cs.name) + '.' + QUOTENAME(ct.name)  + ' DROP CONSTRAINT ' +
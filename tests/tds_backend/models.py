@@ -0,0 +1,20 @@
+from django.db import models
+
+
+class Author(models.Model):
+    name = models.CharField(max_length=50)
+
+
+class Book(models.Model):
+    title = models.CharField(max_length=50)
+    author = models.ForeignKey(Author, models.CASCADE, null=True)
+
+
+class Document(models.Model):
+    data = models.JSONField()
+
+
+class Event(models.Model):
+    created = models.DateTimeField()
+    duration = models.DurationField()
+    flags = models.BigIntegerField(default=0)
@@ -0,0 +1,887 @@
+import datetime
+from array import array
+from collections import Counter
+from decimal import Decimal
+from unittest import mock
+
+from django.core.cache import caches
+from django.core.management import call_command
+from django.core.management.color import no_style
+from django.db.migrations.autodetector import MigrationAutodetector
+from django.db.migrations.state import ModelState, ProjectState
+from django.db import NotSupportedError, connection, models
+from django.db.models import BooleanField, DateTimeField, ExpressionWrapper, F, FloatField, Q, Value
+from django.db.models.functions import Lower
+from django.db.models.sql.subqueries import DeleteQuery, UpdateQuery
+from django.test import SimpleTestCase, TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext, isolate_apps, override_settings
+
+from tds_django.aggregates import ApproxCountDistinct, ApproxPercentileCont, ApproxPercentileDisc
+from tds_django.base import CursorWrapper
+from tds_django.constraints import TableOptions
+from tds_django.ddl import IndexOptions
+from tds_django.indexes import ColumnstoreIndex, CompressedIndex, FullTextIndex, HashIndex
+from tds_django.pagination import KeysetPaginator
+from tds_django.search import FullTextRank
+from tds_django.tz import _links, windows_zone
+
+from .models import Author, Book, Document, Event
+
+
+class WindowsZoneTests(SimpleTestCase):
+    def test_canonical_names(self):
+        for tzname, windows in (
+            ('Asia/Kolkata', 'India Standard Time'),
+            ('Europe/Kyiv', 'FLE Standard Time'),
+            ('America/Argentina/Buenos_Aires', 'Argentina Standard Time'),
+            ('Asia/Ho_Chi_Minh', 'SE Asia Standard Time'),
+            ('America/Nuuk', 'Greenland Standard Time'),
+        ):
+            with self.subTest(tzname=tzname):
+                self.assertEqual(windows_zone(tzname), windows)
+
+    def test_links(self):
+        for link, zone in _links.items():
+            with self.subTest(link=link):
+                self.assertEqual(windows_zone(link), windows_zone(zone))
+                self.assertIsNotNone(windows_zone(link))
+
+
+class SampleTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        author = Author.objects.create(name='a')
+        Book.objects.bulk_create([Book(title='b%d' % i, author=author) for i in range(5)])
+
+    def test_update(self):
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(Book.objects.sample(percent=100).update(title='x'), 5)
+        self.assertIn('TABLESAMPLE', ctx.captured_queries[-1]['sql'])
+        self.assertEqual(Book.objects.filter(title='x').count(), 5)
+
+    def test_delete(self):
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(Book.objects.sample(percent=100).delete(), (5, {'tds_backend.Book': 5}))
+        self.assertTrue(any('TABLESAMPLE' in query['sql'] for query in ctx.captured_queries))
+
+
+class SampleSQLTests(SimpleTestCase):
+    sample = 'FROM [tds_backend_book] U0 TABLESAMPLE (10.0 PERCENT) REPEATABLE (1) WHERE U0.[title] = %s)'
+
+    def test_update(self):
+        query = Book.objects.sample(percent=10, seed=1).filter(title='x').query.chain(UpdateQuery)
+        query.add_update_values({'title': 'y'})
+        compiler = query.get_compiler(connection=connection)
+        compiler.pre_sql_setup()
+        sql, params = compiler.as_sql()
+        self.assertIn('UPDATE [tds_backend_book] SET [title] = %s WHERE [tds_backend_book].[id] IN (SELECT U0.[id] '
+                      + self.sample, sql)
+        self.assertEqual(params, ('y', 'x'))
+
+    def test_delete(self):
+        query = Book.objects.sample(percent=10, seed=1).filter(title='x').query.chain(DeleteQuery)
+        sql, params = query.get_compiler(connection=connection).as_sql()
+        self.assertIn('DELETE FROM [tds_backend_book] WHERE [tds_backend_book].[id] IN (SELECT U0.[id] '
+                      + self.sample, sql)
+        self.assertEqual(params, ('x', ))
+
+    def test_joined(self):
+        sql = str(Author.objects.filter(book__title='x').sample(percent=10).query)
+        self.assertIn('FROM [tds_backend_author] TABLESAMPLE (10.0 PERCENT) INNER JOIN [tds_backend_book] ON', sql)
+        sql = str(Book.objects.sample(percent=10).filter(author__name='x').query)
+        self.assertIn('FROM [tds_backend_book] TABLESAMPLE (10.0 PERCENT) INNER JOIN [tds_backend_author] ON', sql)
+
+
+class NullableJoinTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = Author.objects.create(name='a')
+        cls.book = Book.objects.create(title='b', author=cls.author)
+        cls.orphan = Book.objects.create(title='o')
+
+    def test_condition_false(self):
+        condition = ExpressionWrapper(Q(author__name='x'), output_field=BooleanField())
+        self.assertCountEqual(Book.objects.annotate(f=condition).filter(f=False), [self.book, self.orphan])
+        self.assertCountEqual(Book.objects.annotate(f=condition).filter(f=True), [])
+
+    def test_order_by_nulls(self):
+        books = Book.objects.order_by(F('author__name').asc(nulls_last=True))
+        self.assertSequenceEqual(books, [self.book, self.orphan])
+        books = Book.objects.order_by(F('author__name').desc(nulls_first=True))
+        self.assertSequenceEqual(books, [self.orphan, self.book])
+
+
+class KeysetPaginatorTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.books = [Book.objects.create(title='b', author=Author.objects.create(name='a%d' % i)) for i in range(5)]
+
+    def test_related_ordering(self):
+        paginator = KeysetPaginator(Book.objects.all(), 2, ordering=('-author__name', 'pk'))
+        books, cursor = [], None
+        while True:
+            page = paginator.page(cursor)
+            books += page
+            if not page.has_next():
+                break
+            cursor = page.next_cursor
+        self.assertSequenceEqual(books, self.books[::-1])
+
+    def test_tampered_cursor(self):
+        paginator = KeysetPaginator(Book.objects.all(), 2, ordering=('pk',))
+        cursor = paginator.page().next_cursor
+        with self.assertRaisesMessage(ValueError, 'Invalid cursor.'):
+            paginator.page(cursor[:-1])
+
+
+class KeyTransformExactTests(TestCase):
+    def test_types(self):
+        text, number, string = [Document.objects.create(data={'a': value}) for value in ('1', 1, 'x')]
+        self.assertSequenceEqual(Document.objects.filter(data__a='1'), [text])
+        self.assertSequenceEqual(Document.objects.filter(data__a=1), [number])
+        self.assertSequenceEqual(Document.objects.filter(data__a='x'), [string])
+
+
+class SchemaTests(TransactionTestCase):
+    available_apps = ['tds_backend']
+
+    def get_constraints(self, table):
+        with connection.cursor() as cursor:
+            return connection.introspection.get_constraints(cursor, table)
+
+    def get_indexes(self, table):
+        return {name for name, details in self.get_constraints(table).items() if details['index']}
+
+    @isolate_apps('tds_backend')
+    def test_expression_index_column_becomes_not_null(self):
+        class Tag(models.Model):
+            name = models.CharField(max_length=50, null=True)
+
+            class Meta:
+                app_label = 'tds_backend'
+                indexes = [models.Index(Lower('name'), name='tag_name_lower')]
+
+        with connection.schema_editor() as editor:
+            editor.create_model(Tag)
+        self.addCleanup(self.delete_model, Tag)
+        old_field = Tag._meta.get_field('name')
+        new_field = models.CharField(max_length=50)
+        new_field.set_attributes_from_name('name')
+        new_field.model = Tag
+        with connection.schema_editor() as editor:
+            editor.alter_field(Tag, old_field, new_field, strict=True)
+        self.assertIn('tag_name_lower', self.get_indexes(Tag._meta.db_table))
+
+    @isolate_apps('tds_backend')
+    def test_columnstore_introspection(self):
+        class Measure(models.Model):
+            value = models.FloatField()
+
+            class Meta:
+                app_label = 'tds_backend'
+                indexes = [ColumnstoreIndex(fields=['value'], name='measure_value_cs')]
+
+        with connection.schema_editor() as editor:
+            editor.create_model(Measure)
+        self.addCleanup(self.delete_model, Measure)
+        constraints = self.get_constraints(Measure._meta.db_table)
+        self.assertEqual(constraints['measure_value_cs']['type'], ColumnstoreIndex.suffix)
+        self.assertEqual(constraints['measure_value_cs']['columns'], ['value'])
+
+    @isolate_apps('tds_backend')
+    def test_metadata_cache(self):
+        class Label(models.Model):
+            name = models.CharField(max_length=50)
+
+            class Meta:
+                app_label = 'tds_backend'
+
+        with connection.schema_editor() as editor:
+            editor.create_model(Label)
+        self.addCleanup(self.delete_model, Label)
+        table = Label._meta.db_table
+        fields = []
+        for max_length in (50, 60, 70):
+            field = models.CharField(max_length=max_length)
+            field.set_attributes_from_name('name')
+            field.model = Label
+            fields.append(field)
+        with connection.schema_editor() as editor:
+            editor.alter_field(Label, fields[0], fields[1], strict=True)
+            with CaptureQueriesContext(connection) as captured:
+                editor.alter_field(Label, fields[1], fields[2], strict=True)
+            self.assertEqual([q['sql'] for q in captured if 'sys.' in q['sql'] or 'INFORMATION_SCHEMA' in q['sql']], [])
+            editor.execute('ALTER TABLE %s ADD CONSTRAINT label_name_uniq UNIQUE (name)' % table)
+            self.assertIn('label_name_uniq', editor._table_metadata(table, 'constraints'))
+            with connection.cursor() as cursor:
+                cursor.execute('ALTER TABLE %s ADD CONSTRAINT label_name_check CHECK (LEN(name) > 0)' % table)
+            self.assertIn('label_name_check', editor._table_metadata(table, 'constraints'))
+
+    @isolate_apps('tds_backend')
+    def test_table_options_compression(self):
+        class Audit(models.Model):
+            value = models.FloatField()
+
+            class Meta:
+                app_label = 'tds_backend'
+
+        with connection.schema_editor() as editor:
+            editor.create_model(Audit)
+        self.addCleanup(self.delete_model, Audit)
+        options = TableOptions(name='audit_options', data_compression='PAGE')
+        Audit._meta.constraints = [options]
+        with connection.schema_editor() as editor:
+            editor.add_constraint(Audit, options)
+        with connection.cursor() as cursor:
+            self.assertEqual(connection.introspection.get_data_compression(cursor, Audit._meta.db_table)[None], 'PAGE')
+        Audit._meta.constraints = []
+        with connection.schema_editor() as editor:
+            editor.remove_constraint(Audit, options)
+        with connection.cursor() as cursor:
+            self.assertIsNone(connection.introspection.get_data_compression(cursor, Audit._meta.db_table)[None])
+
+    def delete_model(self, model):
+        with connection.schema_editor() as editor:
+            editor.delete_model(model)
+
+
+class CursorWrapperTests(SimpleTestCase):
+    def wrapper(self, max_signatures=0):
+        return CursorWrapper(mock.Mock(), Counter(), max_signatures)
+
+    def test_paramless_no_formatting(self):
+        cursor = self.wrapper()
+        cursor.execute('SELECT 7 % 2')
+        cursor.cursor.execute.assert_called_once_with('SELECT 7 % 2', None)
+
+    def test_declarations(self):
+        for value, declaration in (
+            ('a', 'NVARCHAR(4000)'),
+            ('a' * 4001, 'NVARCHAR(MAX)'),
+            (b'a', 'VARBINARY(8000)'),
+            (b'a' * 8001, 'VARBINARY(MAX)'),
+            (Decimal('1.5'), 'DECIMAL(38, 10)'),
+            (Decimal('-12345.1234567890'), 'DECIMAL(38, 10)'),
+            (Decimal('1.' + '1' * 20), 'DECIMAL(38, 20)'),
+            (Decimal('1' * 30), 'DECIMAL(38, 0)'),
+        ):
+            with self.subTest(value=value):
+                cursor = self.wrapper()
+                cursor.execute('SELECT %s', [value])
+                param, = cursor.cursor.execute.call_args[0][1]
+                self.assertEqual(param.type.get_declaration(), declaration)
+                self.assertEqual(param.value, value)
+        cursor = self.wrapper()
+        cursor.execute('SELECT %s, %s', [1, None])
+        cursor.cursor.execute.assert_called_once_with('SELECT %s, %s', (1, None))
+
+    def test_signatures(self):
+        cursor = self.wrapper(max_signatures=2)
+        cursor.execute('SELECT %s', ['a'])
+        cursor.execute('SELECT %s', ['abcdef'])
+        self.assertEqual(list(cursor.signatures.values()), [2])
+        cursor.execute('SELECT %s', [1])
+        cursor.execute('SELECT %s, %s', ['a', 'b'])
+        self.assertEqual(len(cursor.signatures), 2)
+        cursor.executemany('SELECT %s', [['a'], ['b']])
+        self.assertEqual(sorted(cursor.signatures.values()), [1, 4])
+
+    def test_signatures_disabled(self):
+        cursor = self.wrapper()
+        cursor.execute('SELECT %s', ['a'])
+        self.assertEqual(cursor.signatures, Counter())
+
+
+class ParamlessQueryTests(TestCase):
+    def test_percent(self):
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 7 % 2')
+            self.assertEqual(cursor.fetchone()[0], 1)
+
+
+class RowConverterTests(SimpleTestCase):
+    def test_fused(self):
+        ops = connection.ops
+        real = ExpressionWrapper(Value(1), output_field=FloatField())
+        flag = ExpressionWrapper(Value(1), output_field=BooleanField())
+        calls = []
+
+        def upper(value, expression, connection_):
+            calls.append((expression, connection_))
+            return value.upper()
+
+        convert = ops.get_row_converter({
+            0: (ops.get_db_converters(real), real),
+            1: ([upper], flag),
+            2: (ops.get_db_converters(flag), flag),
+        })
+        self.assertEqual(convert((Decimal('1.5'), 'a', 1, 'b')), [1.5, 'A', True, 'b'])
+        self.assertEqual(convert((None, 'b', None, None)), [None, 'B', None, None])
+        self.assertEqual(calls, [(flag, connection)] * 2)
+
+    def test_column_no_conversion(self):
+        real = Author._meta.get_field('id').get_col('t', FloatField())
+        self.assertEqual(connection.ops.get_db_converters(real), [])
+
+    @override_settings(USE_TZ=True)
+    def test_datetime(self):
+        ops = connection.ops
+        expression = ExpressionWrapper(Value(1), output_field=DateTimeField())
+        convert = ops.get_row_converter({0: (ops.get_db_converters(expression), expression)})
+        value, = convert((datetime.datetime(2020, 1, 1, 12),))
+        self.assertEqual(value, datetime.datetime(2020, 1, 1, 12, tzinfo=datetime.timezone.utc))
+        self.assertEqual(convert((None,)), [None])
+
+
+class FetchColumnsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        author = Author.objects.create(name='a')
+        cls.books = [Book.objects.create(title='b%d' % i, author=author if i % 2 else None) for i in range(5)]
+
+    def test_columns(self):
+        columns = Book.objects.order_by('pk').fetch_columns('pk', 'title', 'author', chunk_size=2)
+        self.assertEqual(list(columns), ['pk', 'title', 'author'])
+        self.assertEqual(list(columns['pk']), [book.pk for book in self.books])
+        self.assertEqual(list(columns['title']), ['b%d' % i for i in range(5)])
+        self.assertEqual(list(columns['author']), [book.author_id for book in self.books])
+
+    def test_numeric_buffer(self):
+        columns = Book.objects.filter(author__isnull=False).fetch_columns('author')
+        try:
+            import numpy
+        except ImportError:
+            self.assertIsInstance(columns['author'], array)
+        else:
+            self.assertEqual(columns['author'].dtype, numpy.int64)
+
+    def test_empty(self):
+        self.assertEqual({name: list(column) for name, column in Book.objects.none().fetch_columns('pk').items()},
+                         {'pk': []})
+
+
+class DurationSQLTests(SimpleTestCase):
+    def test_dateadd(self):
+        sql, params = Event.objects.annotate(
+            later=F('created') + datetime.timedelta(days=40, microseconds=7),
+        ).values('later').query.sql_with_params()
+        self.assertNotIn('django_dtdelta', sql)
+        self.assertIn('DATEADD(MICROSECOND, ((%s) %% 1000), DATEADD(MILLISECOND, (((%s) / 1000) %% 86400000), '
+                      'DATEADD(DAY, ((%s) / 86400000000), [tds_backend_event].[created])))', sql)
+        self.assertEqual(params, (3456000000007,) * 3)
+
+    def test_subtract(self):
+        sql, _ = Event.objects.annotate(earlier=F('created') - F('duration')).values('earlier').query.sql_with_params()
+        self.assertIn('DATEADD(DAY, -(([tds_backend_event].[duration]) / 86400000000)', sql)
+
+    def test_bitshift(self):
+        sql, _ = Event.objects.annotate(
+            left=F('flags').bitleftshift(3), right=F('flags').bitrightshift(2),
+        ).values('left', 'right').query.sql_with_params()
+        self.assertNotIn('django_bitshift', sql)
+        self.assertIn('([tds_backend_event].[flags] * POWER(CAST(2 AS BIGINT), %s))', sql)
+        self.assertIn('CAST(FLOOR(CAST([tds_backend_event].[flags] AS DECIMAL(38, 0)) / '
+                      'POWER(CAST(2 AS DECIMAL(38, 0)), %s)) AS BIGINT)', sql)
+
+
+class DurationArithmeticTests(TestCase):
+    def test_values(self):
+        created = datetime.datetime(2020, 1, 1)
+        for duration in (
+            datetime.timedelta(microseconds=1),
+            datetime.timedelta(days=40, milliseconds=3, microseconds=7),
+            -datetime.timedelta(days=3, hours=5, microseconds=11),
+        ):
+            with self.subTest(duration=duration):
+                Event.objects.all().delete()
+                Event.objects.create(created=created, duration=duration, flags=-5)
+                event = Event.objects.annotate(
+                    later=F('created') + F('duration'), earlier=F('created') - F('duration'),
+                    left=F('flags').bitleftshift(2), right=F('flags').bitrightshift(1),
+                ).get()
+                self.assertEqual(event.later, created + duration)
+                self.assertEqual(event.earlier, created - duration)
+                self.assertEqual((event.left, event.right), (-20, -3))
+
+
+class FlushTests(SimpleTestCase):
+    fks = {
+        ('book', 'author_id'): ('author', 'id'),
+        ('a', 'b_id'): ('b', 'id'),
+        ('b', 'a_id'): ('a', 'id'),
+    }
+
+    def sql_flush(self, tables, identities=None, memory_optimized=(), **kwargs):
+        graph = (self.fks, identities or {}, set(memory_optimized))
+        with mock.patch.object(connection.ops, '_flush_graph', return_value=graph):
+            sql, = connection.ops.sql_flush(no_style(), tables, **kwargs)
+        return sql.rstrip(';').split(';\n')
+
+    def test_order(self):
+        self.assertEqual(connection.ops._flush_order(['author', 'book', 'other'], self.fks),
+                         (['book', 'other', 'author'], []))
+        self.assertEqual(connection.ops._flush_order(['a', 'b', 'author'], self.fks), (['author'], ['a', 'b']))
+
+    def test_truncate(self):
+        self.assertEqual(self.sql_flush(['author', 'book', 'other'], {'author': 1, 'book': 1}), [
+            'DELETE FROM [book]',
+            'TRUNCATE TABLE [other]',
+            'DELETE FROM [author]',
+        ])
+
+    def test_reset_sequences(self):
+        self.assertEqual(self.sql_flush(['author', 'book'], {'author': 1, 'book': 1}, reset_sequences=True), [
+            'TRUNCATE TABLE [book]',
+            'DELETE FROM [author]',
+            'DBCC CHECKIDENT ([author], RESEED, 1)',
+        ])
+
+    def test_cycle(self):
+        self.assertEqual(self.sql_flush(['a', 'b']), [
+            'ALTER TABLE [a] NOCHECK CONSTRAINT ALL',
+            'ALTER TABLE [b] NOCHECK CONSTRAINT ALL',
+            'DELETE FROM [a]',
+            'DELETE FROM [b]',
+            'ALTER TABLE [a] WITH CHECK CHECK CONSTRAINT ALL',
+            'ALTER TABLE [b] WITH CHECK CHECK CONSTRAINT ALL',
+        ])
+
+    def test_memory_optimized(self):
+        # memory optimized tables do not support TRUNCATE
+        self.assertEqual(self.sql_flush(['book', 'other'], {'book': 1}, memory_optimized=['other'],
+                                        reset_sequences=True), [
+            'TRUNCATE TABLE [book]',
+            'DELETE FROM [other]',
+        ])
+
+    def test_cascade(self):
+        self.assertEqual(self.sql_flush(['author'], allow_cascade=True), [
+            'DELETE FROM [book] WHERE [author_id] IS NOT NULL',
+            'DELETE FROM [author]',
+        ])
+
+    def test_empty(self):
+        self.assertEqual(connection.ops.sql_flush(no_style(), []), [])
+
+
+class FlushGraphTests(TestCase):
+    def test_cached(self):
+        connection.ops._flush_graph()
+        with CaptureQueriesContext(connection) as ctx:
+            fks, identities, _ = connection.ops._flush_graph()
+        self.assertEqual(len(ctx.captured_queries), 1)  # the schema version
+        self.assertEqual(fks[(Book._meta.db_table, 'author_id')], (Author._meta.db_table, 'id'))
+        self.assertIn(Book._meta.db_table, identities)
+
+
+class CloneTests(SimpleTestCase):
+    def test_server_path(self):
+        creation = connection.creation
+        self.assertEqual(creation._server_path('C:\\data\\test.mdf', 'test_1_data'), 'C:\\data\\test_1_data.mdf')
+        self.assertEqual(creation._server_path('/var/opt/test.mdf', 'test_clone.bak', keep_ext=False),
+                         '/var/opt/test_clone.bak')
+
+    def test_delete_backup(self):
+        creation = connection.creation
+        with mock.patch.object(creation, '_nodb_cursor') as nodb_cursor, \
+                mock.patch.object(creation, '_clone_backup', '/var/opt/test_clone.bak'):
+            creation._delete_clone_backup()
+            self.assertIsNone(creation._clone_backup)
+            creation._delete_clone_backup()
+        cursor = nodb_cursor.return_value.__enter__.return_value
+        cursor.execute.assert_called_once_with('EXEC master.sys.xp_delete_file 0, %s', ('/var/opt/test_clone.bak', ))
+
+
+class SnapshotTests(SimpleTestCase):
+    def setUp(self):
+        patcher = mock.patch.object(connection.creation, '_nodb_cursor')
+        self.cursor = patcher.start().return_value.__enter__.return_value
+        self.addCleanup(patcher.stop)
+
+    def test_disabled(self):
+        with mock.patch.dict(connection.settings_dict['TEST'], {'SNAPSHOT_RESET': False}):
+            self.assertIs(connection.creation.restore_snapshot(), False)
+            connection.creation._create_snapshot('test_db', verbosity=0)
+        self.cursor.execute.assert_not_called()
+
+    def test_create(self):
+        self.cursor.fetchall.return_value = [('data', '/var/opt/test_db.mdf', 0), ('log', '/var/opt/test_db.ldf', 1)]
+        with mock.patch.dict(connection.settings_dict['TEST'], {'SNAPSHOT_RESET': True}):
+            connection.creation._create_snapshot('test_db', verbosity=0)
+        self.assertEqual(self.cursor.execute.call_args_list[-1], mock.call(
+            "CREATE DATABASE [test_db_snapshot] ON (NAME = [data], FILENAME = N'/var/opt/test_db_snapshot_data.ss') "
+            "AS SNAPSHOT OF [test_db]"
+        ))
+
+    def test_restore(self):
+        self.cursor.fetchone.return_value = (1, )
+        with mock.patch.dict(connection.settings_dict['TEST'], {'SNAPSHOT_RESET': True}), \
+                mock.patch.dict(connection.settings_dict, {'NAME': 'test_db'}), \
+                mock.patch.object(connection, 'close') as close:
+            self.assertIs(connection.creation.restore_snapshot(), True)
+            close.assert_called_once_with()
+        sql = self.cursor.execute.call_args_list[-1][0][0]
+        self.assertIn("RESTORE DATABASE [test_db] FROM DATABASE_SNAPSHOT = N'test_db_snapshot'", sql)
+
+    def test_no_snapshot(self):
+        self.cursor.fetchone.return_value = (0, )
+        with mock.patch.dict(connection.settings_dict['TEST'], {'SNAPSHOT_RESET': True}):
+            self.assertIs(connection.creation.restore_snapshot(), False)
+        self.assertEqual(self.cursor.execute.call_count, 1)
+
+    def test_flush_restores(self):
+        with mock.patch.object(connection.creation, 'restore_snapshot', return_value=True), \
+                mock.patch('django.db.backends.base.operations.BaseDatabaseOperations.execute_sql_flush') as flush:
+            connection.ops.execute_sql_flush(['DELETE FROM [t]'])
+        flush.assert_not_called()
+
+
+class DateTruncTests(SimpleTestCase):
+    def trunc(self, method, lookup_type, datetrunc):
+        with mock.patch.dict(connection.features.__dict__, {'supports_datetrunc': datetrunc}):
+            return getattr(connection.ops, method)(lookup_type, '[d]', [])[0]
+
+    def test_datetrunc(self):
+        self.assertEqual(self.trunc('datetime_trunc_sql', 'month', True), 'DATETRUNC(month, CAST([d] AS DATETIME2))')
+        self.assertEqual(self.trunc('date_trunc_sql', 'week', True), 'DATETRUNC(iso_week, CAST([d] AS DATE))')
+        self.assertEqual(self.trunc('time_trunc_sql', 'minute', True), 'DATETRUNC(minute, CAST([d] AS TIME))')
+
+    def test_emulation(self):
+        self.assertEqual(self.trunc('datetime_trunc_sql', 'month', False), "dbo.django_datetime_trunc('month', [d])")
+        self.assertEqual(self.trunc('date_trunc_sql', 'week', False),
+                         "CAST(dbo.django_datetime_trunc('week', [d]) AS DATE)")
+        self.assertEqual(self.trunc('time_trunc_sql', 'minute', False),
+                         "CAST(FORMAT(CAST([d] AS TIME), 'hh\\:mm\\:\\0\\0') AS TIME)")
+
+
+class ApproxAggregateTests(SimpleTestCase):
+    def sql(self, features, **aggregates):
+        with mock.patch.dict(connection.features.__dict__, features):
+            return Book.objects.values('author').annotate(**aggregates).query.sql_with_params()[0]
+
+    def test_count_distinct(self):
+        self.assertIn('APPROX_COUNT_DISTINCT([tds_backend_book].[title]) AS [n]',
+                      self.sql({'supports_approx_count_distinct': True}, n=ApproxCountDistinct('title')))
+        self.assertIn('COUNT_BIG(DISTINCT [tds_backend_book].[title]) AS [n]',
+                      self.sql({'supports_approx_count_distinct': False}, n=ApproxCountDistinct('title')))
+
+    def test_percentile(self):
+        features = {'supports_approx_percentile': True}
+        self.assertIn('APPROX_PERCENTILE_CONT(0.5) WITHIN GROUP (ORDER BY [tds_backend_book].[id]) AS [p]',
+                      self.sql(features, p=ApproxPercentileCont('id', 0.5)))
+        self.assertIn('APPROX_PERCENTILE_DISC(0.9) WITHIN GROUP (ORDER BY [tds_backend_book].[id]) AS [p]',
+                      self.sql(features, p=ApproxPercentileDisc('id', 0.9)))
+        with self.assertRaisesMessage(NotSupportedError, 'APPROX_PERCENTILE_CONT requires SQL Server 2022.'):
+            self.sql({'supports_approx_percentile': False}, p=ApproxPercentileCont('id', 0.5))
+        with self.assertRaisesMessage(ValueError, 'percentile must be between 0 and 1.'):
+            ApproxPercentileCont('id', 2)
+
+
+class ManagerMethodTests(SimpleTestCase):
+    def test_queryset_methods(self):
+        for name in ('fetch_columns', 'sample', 'seek'):
+            with self.subTest(name=name):
+                self.assertTrue(callable(getattr(Book.objects, name, None)))
+
+
+@override_settings(CACHES={
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+    'tds': {
+        'BACKEND': 'tds_django.cache.DatabaseCache',
+        'LOCATION': 'tds_cache_table',
+        'OPTIONS': {'MAX_ENTRIES': 9, 'CULL_FREQUENCY': 3},
+    },
+})
+class DatabaseCacheTests(TransactionTestCase):
+    available_apps = ['tds_backend']
+
+    def setUp(self):
+        call_command('createcachetable', 'tds_cache_table', verbosity=0)
+        self.addCleanup(self.drop_table)
+        self.cache = caches['tds']
+
+    def drop_table(self):
+        with connection.cursor() as cursor:
+            cursor.execute('DROP TABLE [tds_cache_table]')
+
+    def test_set_get(self):
+        self.cache.set('key', {'value': 1})
+        self.assertEqual(self.cache.get('key'), {'value': 1})
+        self.cache.set('key', 'other')
+        self.assertEqual(self.cache.get('key'), 'other')
+        self.assertIsNone(self.cache.get('missing'))
+        self.cache.set('expired', 1, timeout=0)
+        self.assertEqual(self.cache.get('expired', 'default'), 'default')
+
+    def test_add(self):
+        self.assertIs(self.cache.add('key', 1), True)
+        self.assertIs(self.cache.add('key', 2), False)
+        self.assertEqual(self.cache.get('key'), 1)
+        self.cache.set('expired', 1, timeout=0)
+        self.assertIs(self.cache.add('expired', 2), True)
+        self.assertEqual(self.cache.get('expired'), 2)
+
+    def test_touch(self):
+        self.cache.set('key', 1, timeout=0)
+        self.assertIs(self.cache.touch('key', 60), False)
+        self.cache.set('key', 1)
+        self.assertIs(self.cache.touch('key', 60), True)
+        self.assertIs(self.cache.touch('missing', 60), False)
+
+    def test_many(self):
+        self.assertEqual(self.cache.set_many({'a': 1, 'b': 2, 'c': 3}), [])
+        self.assertEqual(self.cache.get_many(['a', 'b', 'missing']), {'a': 1, 'b': 2})
+        self.cache.delete_many(['a', 'b', 'missing'])
+        self.assertEqual(self.cache.get_many(['a', 'b', 'c']), {'c': 3})
+        self.assertIs(self.cache.delete('c'), True)
+        self.assertIs(self.cache.delete('c'), False)
+
+    def test_cull(self):
+        for i in range(10):
+            self.cache.set('k%d' % i, i, timeout=100 + i)
+        self.cache.set('k10', 10)
+        self.assertEqual([self.cache.has_key('k%d' % i) for i in range(11)], [False] * 3 + [True] * 8)
+
+    def test_cull_expired_first(self):
+        for i in range(2):
+            self.cache.set('x%d' % i, i, timeout=0)
+        for i in range(8):
+            self.cache.set('k%d' % i, i)
+        self.cache.set('k8', 8)
+        self.assertEqual(self.cache.get_many(['k%d' % i for i in range(9)]), {'k%d' % i: i for i in range(9)})
+
+
+class FullTextTests(SimpleTestCase):
+    def test_lookups(self):
+        sql, params = Book.objects.filter(title__contains_fts='"red*" AND shoe').query.sql_with_params()
+        self.assertIn('WHERE CONTAINS([tds_backend_book].[title], %s)', sql)
+        self.assertEqual(params, ('"red*" AND shoe', ))
+        sql, params = Book.objects.filter(title__freetext='red shoes').query.sql_with_params()
+        self.assertIn('WHERE FREETEXT([tds_backend_book].[title], %s)', sql)
+
+    def test_rank(self):
+        sql, params = Book.objects.annotate(rank=FullTextRank('title', 'red')).values('rank').query.sql_with_params()
+        self.assertIn('ISNULL((SELECT ft.[RANK] FROM CONTAINSTABLE([tds_backend_book], [title], %s) AS ft '
+                      'WHERE ft.[KEY] = [tds_backend_book].[id]), 0) AS [rank]', sql)
+        self.assertEqual(params, ('red', ))
+        sql, _ = Book.objects.annotate(rank=FullTextRank('title', 'red', freetext=True)).query.sql_with_params()
+        self.assertIn('FREETEXTTABLE([tds_backend_book], [title], %s)', sql)
+        with self.assertRaisesMessage(ValueError, 'FullTextRank only supports a column of the model.'):
+            str(Book.objects.annotate(rank=FullTextRank(Lower('title'), 'red')).query)
+
+    def test_index(self):
+        editor = connection.schema_editor()
+        index = FullTextIndex(fields=['title'], name='book_title_fts')
+        sql = str(index.create_sql(Book, editor))
+        self.assertIn("IF NOT EXISTS (SELECT 1 FROM sys.fulltext_catalogs WHERE name = N'django_fulltext') "
+                      "CREATE FULLTEXT CATALOG [django_fulltext]", sql)
+        self.assertIn("EXEC(N'CREATE FULLTEXT INDEX ON [tds_backend_book] ([title]) KEY INDEX ' + QUOTENAME(@key) + "
+                      "N' ON [django_fulltext]')", sql)
+        self.assertEqual(str(index.remove_sql(Book, editor)), 'DROP FULLTEXT INDEX ON [tds_backend_book]')
+
+    def test_language(self):
+        editor = connection.schema_editor()
+        sql = str(FullTextIndex(fields=['title'], name='fts', language=1033).create_sql(Book, editor))
+        self.assertIn('([title] LANGUAGE 1033)', sql)
+        sql = str(FullTextIndex(fields=['title'], name='fts', language='English').create_sql(Book, editor))
+        self.assertIn("([title] LANGUAGE N''English'')", sql)
+
+    def test_deconstruct(self):
+        path, args, kwargs = FullTextIndex(fields=['title'], name='fts', catalog='c', language='English').deconstruct()
+        self.assertEqual(path, 'tds_django.indexes.FullTextIndex')
+        self.assertEqual(kwargs, {'fields': ['title'], 'name': 'fts', 'catalog': 'c', 'language': 'English'})
+
+
+class ColumnstoreIndexTests(SimpleTestCase):
+    def test_clustered(self):
+        index = ColumnstoreIndex(name='event_cci', clustered=True)
+        self.assertEqual(str(index.create_sql(Event, connection.schema_editor())),
+                         'CREATE CLUSTERED COLUMNSTORE INDEX [event_cci] ON [tds_backend_event]')
+        self.assertEqual(index.deconstruct()[2], {'name': 'event_cci', 'clustered': True})
+
+    def test_nonclustered(self):
+        index = ColumnstoreIndex(name='event_ncci', fields=['created', 'duration'], condition=Q(flags__gt=0),
+                                 data_compression='COLUMNSTORE_ARCHIVE')
+        self.assertEqual(
+            str(index.create_sql(Event, connection.schema_editor())),
+            'CREATE NONCLUSTERED COLUMNSTORE INDEX [event_ncci] ON [tds_backend_event] ([created], [duration]) '
+            'WHERE [flags] > 0 WITH (DATA_COMPRESSION = COLUMNSTORE_ARCHIVE)',
+        )
+        self.assertEqual(index.deconstruct()[2], {
+            'name': 'event_ncci', 'fields': ['created', 'duration'], 'condition': Q(flags__gt=0),
+            'data_compression': 'COLUMNSTORE_ARCHIVE',
+        })
+
+    def test_invalid(self):
+        with self.assertRaisesMessage(ValueError, 'A clustered ColumnstoreIndex covers the whole table'):
+            ColumnstoreIndex(name='cci', fields=['created'], clustered=True)
+        with self.assertRaisesMessage(ValueError, 'A nonclustered ColumnstoreIndex requires fields.'):
+            ColumnstoreIndex(name='ncci')
+
+    def test_introspected_types(self):
+        types = connection.introspection._index_types
+        self.assertEqual((types[1], types[2]), (models.Index.suffix, models.Index.suffix))
+        self.assertEqual((types[5], types[6]), (ColumnstoreIndex.suffix, ColumnstoreIndex.suffix))
+
+
+class TableOptionsTests(SimpleTestCase):
+    def collect_sql(self, method, *args):
+        editor = connection.schema_editor(collect_sql=True)
+        editor.deferred_sql = []
+        getattr(editor, method)(*args)
+        return editor.collected_sql
+
+    @isolate_apps('tds_backend')
+    def test_create_model(self):
+        class Session(models.Model):
+            key = models.CharField(max_length=40)
+
+            class Meta:
+                app_label = 'tds_backend'
+                constraints = [TableOptions(name='session_options', data_compression='ROW',
+                                            memory_optimized='schema_only')]
+
+        self.assertEqual(self.collect_sql('create_model', Session), [
+            'CREATE TABLE [tds_backend_session] ([id] INT NOT NULL PRIMARY KEY NONCLUSTERED IDENTITY (1, 1), '
+            '[key] NVARCHAR(40) NOT NULL) WITH (MEMORY_OPTIMIZED = ON, DURABILITY = SCHEMA_ONLY);',
+            'ALTER TABLE [tds_backend_session] REBUILD PARTITION = ALL WITH (DATA_COMPRESSION = ROW);',
+        ])
+
+    @isolate_apps('tds_backend')
+    def test_alter_compression(self):
+        options = TableOptions(name='audit_options', data_compression='PAGE')
+
+        class Audit(models.Model):
+            class Meta:
+                app_label = 'tds_backend'
+                constraints = [options]
+
+        self.assertEqual(self.collect_sql('add_constraint', Audit, options), [
+            'ALTER TABLE [tds_backend_audit] REBUILD PARTITION = ALL WITH (DATA_COMPRESSION = PAGE);',
+        ])
+        Audit._meta.constraints = []
+        self.assertEqual(self.collect_sql('remove_constraint', Audit, options), [
+            'ALTER TABLE [tds_backend_audit] REBUILD PARTITION = ALL WITH (DATA_COMPRESSION = NONE);',
+        ])
+
+    def test_other_backends(self):
+        options = TableOptions(name='options', data_compression='PAGE')
+        editor = connection.schema_editor()
+        self.assertIsNone(options.constraint_sql(Event, editor))
+        self.assertIsNone(options.create_sql(Event, editor))
+        self.assertIsNone(options.remove_sql(Event, editor))
+
+    def test_deconstruct(self):
+        options = TableOptions(name='options', memory_optimized=True)
+        path, args, kwargs = options.deconstruct()
+        self.assertEqual(path, 'tds_django.constraints.TableOptions')
+        self.assertEqual(kwargs, {'name': 'options', 'memory_optimized': True})
+        self.assertEqual(options, TableOptions(**kwargs))
+        self.assertNotEqual(options, TableOptions(name='options', memory_optimized='SCHEMA_ONLY'))
+
+    def test_autodetector(self):
+        def state(options):
+            project = ProjectState()
+            project.add_model(ModelState('tds_backend', 'Audit', [('id', models.AutoField(primary_key=True))], {
+                'constraints': [options],
+            }))
+            return project
+
+        changes = MigrationAutodetector(
+            state(TableOptions(name='audit_options', data_compression='ROW')),
+            state(TableOptions(name='audit_options', data_compression='PAGE')),
+        )._detect_changes()
+        operations = changes['tds_backend'][0].operations
+        self.assertEqual([type(operation).__name__ for operation in operations],
+                         ['RemoveConstraint', 'AddConstraint'])
+        self.assertEqual(operations[1].constraint.data_compression, 'PAGE')
+
+
+class HashIndexTests(SimpleTestCase):
+    @isolate_apps('tds_backend')
+    def test_memory_optimized(self):
+        class Session(models.Model):
+            key = models.CharField(max_length=40)
+            expires = models.DateTimeField()
+
+            class Meta:
+                app_label = 'tds_backend'
+                constraints = [TableOptions(name='session_options', memory_optimized=True)]
+
+        editor = connection.schema_editor()
+        index = HashIndex(fields=['key'], name='session_key', bucket_count=1024)
+        self.assertEqual(
+            str(index.create_sql(Session, editor)),
+            'ALTER TABLE [tds_backend_session] ADD INDEX [session_key] NONCLUSTERED HASH ([key]) '
+            'WITH (BUCKET_COUNT = 1024)',
+        )
+        self.assertEqual(
+            str(models.Index(fields=['expires'], name='session_expires').create_sql(Session, editor)),
+            'ALTER TABLE [tds_backend_session] ADD INDEX [session_expires] NONCLUSTERED ([expires])',
+        )
+        self.assertEqual(str(index.remove_sql(Session, editor)).split(';')[0],
+                         'ALTER TABLE [tds_backend_session] DROP INDEX [session_key]')
+        self.assertEqual(index.deconstruct()[2], {'fields': ['key'], 'name': 'session_key', 'bucket_count': 1024})
+
+    def test_disk_table(self):
+        index = HashIndex(fields=['flags'], name='event_flags', bucket_count=1024)
+        with self.assertRaisesMessage(NotSupportedError, 'Hash indexes need a memory optimized table.'):
+            index.create_sql(Event, connection.schema_editor())
+
+
+class IndexOptionsTests(SimpleTestCase):
+    def create_sql(self, editor, index, **options):
+        IndexOptions(**options).database_forwards('tds_backend', editor, None, None)
+        return str(index.create_sql(Event, editor))
+
+    def test_with_clause(self):
+        editor = connection.schema_editor()
+        index = models.Index(fields=['flags'], name='event_flags')
+        self.assertEqual(
+            self.create_sql(editor, index, online=True, resumable=True, max_duration=60, maxdop=4,
+                            wait_at_low_priority=(5, 'self')),
+            'CREATE INDEX [event_flags] ON [tds_backend_event] ([flags]) WITH (ONLINE = ON (WAIT_AT_LOW_PRIORITY '
+            '(MAX_DURATION = 5 MINUTES, ABORT_AFTER_WAIT = SELF)), RESUMABLE = ON, MAX_DURATION = 60 MINUTES, '
+            'MAXDOP = 4)',
+        )
+        self.assertEqual(editor._alter_column_online_sql(), ' WITH (ONLINE = ON)')
+        compressed = CompressedIndex(fields=['flags'], name='event_flags', data_compression='PAGE')
+        self.assertEqual(self.create_sql(editor, compressed, maxdop=0),
+                         'CREATE INDEX [event_flags] ON [tds_backend_event] ([flags]) '
+                         'WITH (DATA_COMPRESSION = PAGE, MAXDOP = 0)')
+        self.assertEqual(self.create_sql(editor, index), 'CREATE INDEX [event_flags] ON [tds_backend_event] ([flags])')
+        self.assertEqual(editor._alter_column_online_sql(), '')
+
+    def test_other_backends(self):
+        editor = mock.Mock(connection=mock.Mock(vendor='postgresql'), index_options={})
+        IndexOptions(online=True).database_forwards('tds_backend', editor, None, None)
+        self.assertEqual(editor.index_options, {})
+
+    def test_invalid(self):
+        with self.assertRaisesMessage(ValueError, 'Unknown index options: sort_in_tempdb.'):
+            IndexOptions(sort_in_tempdb=True)
+        with self.assertRaisesMessage(ValueError, 'A resumable index operation has to be online.'):
+            IndexOptions(resumable=True)
+
+    def test_describe(self):
+        self.assertEqual(IndexOptions(online=True, maxdop=2).describe(), 'Set index options maxdop=2, online=True')
+
+
+class MetadataInvalidationTests(SimpleTestCase):
+    def invalidate(self, sql):
+        editor = connection.schema_editor()
+        editor._metadata = {('a', 'constraints'): {}, ('b', 'constraints'): {}}
+        editor._invalidate_metadata(sql)
+        return sorted(table for table, _ in editor._metadata)
+
+    def test_quoted_table(self):
+        self.assertEqual(self.invalidate('ALTER TABLE [a] DROP CONSTRAINT [x]'), ['b'])
+        self.assertEqual(self.invalidate('CREATE INDEX [x] ON [c] ([y])'), [])
+
+    def test_unquoted_table(self):
+        self.assertEqual(self.invalidate('ALTER TABLE a DROP CONSTRAINT x'), [])
+        self.assertEqual(self.invalidate("EXEC sp_rename 'a', 'c'"), [])
+
+    def test_not_ddl(self):
+        self.assertEqual(self.invalidate("INSERT INTO [a] ([key], [v]) VALUES (N'DROP INDEX', 1)"), ['a', 'b'])
+        self.assertEqual(self.invalidate('SELECT [index] FROM [b]'), ['a', 'b'])